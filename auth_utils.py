@@ -1,16 +1,97 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from fastapi import HTTPException, Depends
+import hmac
+import os
+import threading
+import time
+from fastapi import HTTPException, Depends, Header
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from database import get_db
+from typing import TYPE_CHECKING
+from database import get_db, get_async_db
 from models.user_model import UserORM
 
+if TYPE_CHECKING:  # 비동기 모드에서만 실제로 import (greenlet 필요)
+    from sqlalchemy.ext.asyncio import AsyncSession
+
 SECRET_KEY = "YOUR_SECRET_KEY_GENERATE_RANDOM"  # 나중에 .env로 이동 가능
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24시간
 
+# 운영용 내부 API(/api/_internal/*) 토큰, 지정하지 않으면 내부 API는 404
+INTERNAL_TOKEN = os.getenv("INTERNAL_TOKEN")
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login")
+# 로그인하지 않아도 되는 API용 (토큰이 없으면 None)
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login", auto_error=False)
+
+# 인증 유저 캐시 (sub → 유저 정보), USER_CACHE_SIZE=0 이면 사용 안 함
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))
+
+# 캐시에 담는 컬럼 (비밀번호는 제외)
+_CACHED_USER_FIELDS = ("id", "name", "nickname", "email")
+
+
+class _UserCache:
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._items: OrderedDict[str, tuple[dict, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None or item[1] <= time.monotonic():
+                if item is not None:
+                    del self._items[key]
+                self.misses += 1
+                return None
+
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def set(self, key: str, fields: dict):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._items[key] = (fields, time.monotonic() + self.ttl_seconds)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def invalidate(self, key: str):
+        with self._lock:
+            self._items.pop(key, None)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._items),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+_user_cache = _UserCache(USER_CACHE_SIZE, USER_CACHE_TTL)
+
+
+# 프로필/비밀번호 변경 시 호출
+def invalidate_user(user_id: int):
+    _user_cache.invalidate(str(user_id))
+
+
+def user_cache_stats() -> dict:
+    return _user_cache.stats()
 
 
 # JWT 생성 함수
@@ -26,11 +107,8 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
-# 현재 로그인된 유저 조회
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-):
+# 토큰에서 유저 id(sub) 추출
+def _decode_user_id(token: str) -> str:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: int = payload.get("sub")
@@ -41,8 +119,89 @@ def get_current_user(
     except JWTError:
         raise HTTPException(401, "유효하지 않은 토큰입니다.")
 
+    return str(user_id)
+
+
+def _cache_user(user: UserORM):
+    _user_cache.set(str(user.id), {field: getattr(user, field) for field in _CACHED_USER_FIELDS})
+
+
+# 현재 로그인된 유저 조회
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+):
+    user_id = _decode_user_id(token)
+
+    # 캐시 적중 시 DB 조회 없이 세션에 붙지 않은 UserORM으로 반환
+    cached = _user_cache.get(user_id)
+    if cached is not None:
+        return UserORM(**cached)
+
     user = db.query(UserORM).filter(UserORM.id == user_id).first()
     if not user:
         raise HTTPException(404, "사용자를 찾을 수 없습니다.")
 
+    _cache_user(user)
+    return user
+
+
+# 로그인 여부가 선택인 API에서 현재 유저 조회 (비로그인/잘못된 토큰이면 None)
+def get_current_user_optional(
+    token: str | None = Depends(optional_oauth2_scheme),
+    db: Session = Depends(get_db)
+):
+    if not token:
+        return None
+
+    try:
+        return get_current_user(token, db)
+    except HTTPException:
+        return None
+
+
+# -------------------------------
+# 비동기 버전 (DB_ASYNC=1)
+# -------------------------------
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: "AsyncSession" = Depends(get_async_db)
+):
+    user_id = _decode_user_id(token)
+
+    cached = _user_cache.get(user_id)
+    if cached is not None:
+        return UserORM(**cached)
+
+    result = await db.execute(select(UserORM).where(UserORM.id == user_id))
+    user = result.scalars().first()
+    if not user:
+        raise HTTPException(404, "사용자를 찾을 수 없습니다.")
+
+    _cache_user(user)
     return user
+
+
+async def get_current_user_optional_async(
+    token: str | None = Depends(optional_oauth2_scheme),
+    db: "AsyncSession" = Depends(get_async_db)
+):
+    if not token:
+        return None
+
+    try:
+        return await get_current_user_async(token, db)
+    except HTTPException:
+        return None
+
+
+# -------------------------------
+# 내부 API 접근 제어 (X-Internal-Token 헤더)
+# -------------------------------
+def require_internal_token(x_internal_token: str | None = Header(None)):
+    if not INTERNAL_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_internal_token is None or not hmac.compare_digest(
+        x_internal_token.encode("utf-8"), INTERNAL_TOKEN.encode("utf-8")
+    ):
+        raise HTTPException(status_code=403, detail="내부 API 접근 권한이 없습니다.")
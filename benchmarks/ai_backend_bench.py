@@ -0,0 +1,110 @@
+# benchmarks/ai_backend_bench.py
+# 추론 백엔드(eager / int8 / onnx)별 토큰 처리량, 지연시간, 메모리 비교
+# 백엔드마다 별도 프로세스에서 실행해 메모리 사용량이 섞이지 않게 한다.
+#
+# 사용법 (프로젝트 루트에서):
+#   python -m benchmarks.ai_backend_bench --backends eager,int8 --runs 5
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+PROMPTS = [
+    "제목: 오늘 점심 메뉴 추천\n내용: 회사 근처에서 먹을 만한 점심 메뉴를 추천해주세요.\n\n"
+    "위 글에 자연스럽게 달릴 한국어 댓글 한 줄을 작성하세요:",
+    "제목: 주말 등산 후기\n내용: 북한산에 다녀왔는데 날씨가 정말 좋았어요.\n\n"
+    "위 글에 자연스럽게 달릴 한국어 댓글 한 줄을 작성하세요:",
+    "제목: 파이썬 공부 질문\n내용: FastAPI에서 비동기 라우터는 언제 쓰는 게 좋을까요?\n\n"
+    "위 글에 자연스럽게 달릴 한국어 댓글 한 줄을 작성하세요:",
+]
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+# 한 백엔드를 현재 프로세스에서 측정
+def run_one(backend: str, runs: int, max_new_tokens: int) -> dict:
+    import torch
+    from controllers.ai_inference import ModelLoader, GENERATION_KWARGS
+
+    rss_before = _rss_mb()
+    started = time.perf_counter()
+    tokenizer, model = ModelLoader(backend=backend).load()
+    load_seconds = time.perf_counter() - started
+
+    # 같은 길이를 생성하도록 줄바꿈 조기 종료 없이 고정 토큰 수로 측정
+    kwargs = {
+        **GENERATION_KWARGS,
+        "max_new_tokens": max_new_tokens,
+        "min_new_tokens": max_new_tokens,
+        "pad_token_id": tokenizer.pad_token_id,
+    }
+
+    # 워밍업
+    model.generate(**tokenizer(PROMPTS[0], return_tensors="pt"), **kwargs)
+
+    latencies = []
+    tokens = 0
+    torch.manual_seed(0)
+    for _ in range(runs):
+        for prompt in PROMPTS:
+            inputs = tokenizer(prompt, return_tensors="pt")
+            t = time.perf_counter()
+            outputs = model.generate(**inputs, **kwargs)
+            latencies.append(time.perf_counter() - t)
+            tokens += outputs.shape[1] - inputs["input_ids"].shape[1]
+
+    return {
+        "backend": backend,
+        "load_s": load_seconds,
+        "rss_mb": _rss_mb() - rss_before,
+        "tokens_per_s": tokens / sum(latencies),
+        "p50_s": statistics.median(latencies),
+        "max_s": max(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backends", default="eager,int8")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-new-tokens", type=int, default=60)
+    parser.add_argument("--run-one", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one:
+        print(json.dumps(run_one(args.run_one, args.runs, args.max_new_tokens)))
+        return
+
+    print(f"{'backend':>8} {'load(s)':>8} {'rss(MB)':>8} {'tok/s':>8} {'p50(s)':>8} {'max(s)':>8}")
+    for backend in args.backends.split(","):
+        proc = subprocess.run(
+            [
+                sys.executable, "-m", "benchmarks.ai_backend_bench",
+                "--run-one", backend,
+                "--runs", str(args.runs),
+                "--max-new-tokens", str(args.max_new_tokens),
+            ],
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            print(f"{backend:>8} 실패: {proc.stderr.strip().splitlines()[-1]}")
+            continue
+
+        r = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(
+            f"{r['backend']:>8} {r['load_s']:>8.2f} {r['rss_mb']:>8.0f} "
+            f"{r['tokens_per_s']:>8.1f} {r['p50_s']:>8.2f} {r['max_s']:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# benchmarks/ai_batch_bench.py
+# 마이크로 배치 크기별 AI 댓글 생성 처리량/지연시간 측정
+#
+# 사용법 (프로젝트 루트에서):
+#   python -m benchmarks.ai_batch_bench --requests 32 --concurrency 16 --batch-sizes 1,2,4,8,16
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from controllers.ai_batcher import MicroBatcher
+from controllers.ai_inference import model_loader, generate_texts
+
+PROMPT = (
+    "제목: 오늘 점심 메뉴 추천\n"
+    "내용: 회사 근처에서 먹을 만한 점심 메뉴를 추천해주세요.\n\n"
+    "위 글에 자연스럽게 달릴 한국어 댓글 한 줄을 작성하세요:"
+)
+
+
+def run(batch_size: int, window_ms: float, requests: int, concurrency: int):
+    batcher = MicroBatcher(generate_texts, max_batch_size=batch_size, window_ms=window_ms)
+    batcher.start()
+
+    def one_request(_):
+        started = time.perf_counter()
+        batcher.submit(PROMPT).result()
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = sorted(pool.map(one_request, range(requests)))
+    elapsed = time.perf_counter() - started
+    batcher.stop()
+
+    return {
+        "batch_size": batch_size,
+        "throughput": requests / elapsed,
+        "p50": statistics.median(latencies),
+        "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--batch-sizes", default="1,2,4,8,16")
+    parser.add_argument("--window-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    # 모델 로딩 시간은 측정에서 제외
+    model_loader.load()
+    generate_texts([PROMPT])
+
+    print(f"{'batch':>5} {'req/s':>8} {'p50(s)':>8} {'p95(s)':>8}")
+    for batch_size in (int(x) for x in args.batch_sizes.split(",")):
+        result = run(batch_size, args.window_ms, args.requests, args.concurrency)
+        print(
+            f"{result['batch_size']:>5} {result['throughput']:>8.2f} "
+            f"{result['p50']:>8.2f} {result['p95']:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
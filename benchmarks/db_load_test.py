@@ -0,0 +1,141 @@
+# benchmarks/db_load_test.py
+# 동기(DB_ASYNC=0) / 비동기(DB_ASYNC=1) DB 모드의 처리량과 지연시간 비교
+# 로컬 SQLite 파일을 만들어 데이터를 채운 뒤, 모드별로 uvicorn을 띄워 읽기 API에 부하를 준다.
+# 응답 캐시/업로드 메모리 캐시는 끄고 측정한다 (켜 두면 대부분 캐시 적중이라 DB 모드 차이가 드러나지 않음).
+#
+# 사용법 (프로젝트 루트에서, httpx 필요):
+#   python -m benchmarks.db_load_test --requests 2000 --concurrency 64
+#   python -m benchmarks.db_load_test --with-cache   # 캐시를 켠 결과도 함께 출력
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+DB_PATH = "bench_load.db"
+PORT = 8765
+
+
+def seed(posts: int, comments_per_post: int):
+    os.environ["DATABASE_URL"] = f"sqlite:///./{DB_PATH}"
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+
+    from datetime import datetime
+    from database import Base, engine, SessionLocal
+    from models.post_model import PostORM
+    from models.comment_model import CommentORM
+    import models.like_model  # noqa: F401  (테이블 생성용)
+    import models.user_model  # noqa: F401
+
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    now = datetime.now()
+    for i in range(1, posts + 1):
+        db.add(PostORM(
+            id=i, title=f"게시글 {i}", content="본문 " * 200, excerpt="본문 " * 10,
+            author="bench", views=0, likes=0, created_at=now,
+        ))
+        for _ in range(comments_per_post):
+            db.add(CommentORM(post_id=i, author="bench", content="댓글입니다", created_at=now))
+    db.commit()
+    db.close()
+
+
+async def load(requests: int, concurrency: int, posts: int) -> dict:
+    paths = ["/api/posts?limit=20", "/api/posts/{id}", "/api/posts/{id}/comments"]
+    latencies = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker(client: httpx.AsyncClient):
+        nonlocal errors
+        for i in counter:
+            path = paths[i % len(paths)].format(id=i % posts + 1)
+            started = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORT}", limits=limits, timeout=30) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "errors": errors,
+    }
+
+
+def wait_until_up(timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{PORT}/api/ai/ready", timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError("서버가 시작되지 않았습니다.")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--posts", type=int, default=500)
+    parser.add_argument("--comments-per-post", type=int, default=5)
+    parser.add_argument("--with-cache", action="store_true", help="응답 캐시를 켠 결과도 측정")
+    args = parser.parse_args()
+
+    seed(args.posts, args.comments_per_post)
+
+    runs = [(mode, False) for mode in ("0", "1")]
+    if args.with_cache:
+        runs += [(mode, True) for mode in ("0", "1")]
+
+    print(f"{'mode':>6} {'cache':>6} {'req/s':>8} {'p50(ms)':>8} {'p99(ms)':>8} {'errors':>6}")
+    for mode, cache in runs:
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///./{DB_PATH}",
+            "DB_ASYNC": mode,
+            "AI_WORKER_PROCESSES": "0",
+        }
+        if not cache:
+            env["RESPONSE_CACHE_TTL"] = "0"
+            env["UPLOAD_HOT_CACHE_BYTES"] = "0"
+            env.pop("RESPONSE_CACHE_REDIS_URL", None)
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(PORT), "--log-level", "warning"],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_until_up()
+            result = asyncio.run(load(args.requests, args.concurrency, args.posts))
+        finally:
+            server.terminate()
+            server.wait()
+
+        name = "async" if mode == "1" else "sync"
+        print(
+            f"{name:>6} {'on' if cache else 'off':>6} {result['rps']:>8.1f} {result['p50']:>8.1f} "
+            f"{result['p99']:>8.1f} {result['errors']:>6}"
+        )
+
+    os.remove(DB_PATH)
+
+
+if __name__ == "__main__":
+    main()
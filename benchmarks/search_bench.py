@@ -0,0 +1,140 @@
+# benchmarks/search_bench.py
+# 게시글 검색 벤치마크 (로컬 SQLite FTS5)
+# 게시글 N개(기본 100만)를 생성해 색인한 뒤, search_docs 검색과 LIKE '%검색어%' 전체 스캔의 지연시간을 비교한다.
+#
+# 사용법 (프로젝트 루트에서):
+#   python -m benchmarks.search_bench --posts 1000000 --queries 200
+#   python -m benchmarks.search_bench --posts 1000000 --skip-seed   # 이전에 만든 DB 재사용
+import argparse
+import os
+import random
+import statistics
+import time
+
+DB_PATH = "bench_search.db"
+
+# 자주 나오는 단어 + 음절 조합으로 만든 드문 단어 (실제 게시판처럼 단어 빈도가 고르지 않게)
+_COMMON_WORDS = (
+    "오늘 날씨 점심 메뉴 김치찌개 된장찌개 주말 계획 등산 여행 제주도 부산 서울 카페 커피 "
+    "영화 추천 드라마 공부 시험 회사 출근 퇴근 야근 운동 헬스 다이어트 고양이 강아지 산책"
+).split()
+_SYLLABLES = "가나다라마바사아자차카타파하거너더러머버서어저처커터퍼허고노도로모보소오조초코토포호구누두루무부수우주추쿠투푸후"
+_RARE_WORDS = [
+    "".join(random.Random(i).choice(_SYLLABLES) for _ in range(random.Random(-i).randint(2, 4)))
+    for i in range(20000)
+]
+_PARTICLES = ("", "은", "는", "이", "가", "을", "를", "에서", "도", "랑")
+
+
+def _word(rng: random.Random) -> str:
+    return rng.choice(_COMMON_WORDS) if rng.random() < 0.3 else rng.choice(_RARE_WORDS)
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(_word(rng) + rng.choice(_PARTICLES) for _ in range(words))
+
+
+def seed(posts: int, batch_size: int = 10000):
+    from datetime import datetime
+    from sqlalchemy import insert
+    from database import Base, engine
+    from models.post_model import PostORM
+    from models.comment_model import CommentORM
+    import models.like_model  # noqa: F401  (테이블 생성용)
+    import models.user_model  # noqa: F401
+    import models.upload_model  # noqa: F401
+
+    Base.metadata.create_all(engine)
+    rng = random.Random(42)
+    now = datetime.now()
+
+    started = time.perf_counter()
+    for start in range(1, posts + 1, batch_size):
+        end = min(start + batch_size, posts + 1)
+        rows = [
+            {
+                "id": i, "title": _sentence(rng, 3)[:26], "content": _sentence(rng, 40), "excerpt": "",
+                "author": "bench", "views": 0, "likes": 0, "comment_count": 0, "created_at": now,
+            }
+            for i in range(start, end)
+        ]
+        comments = [
+            {"post_id": i, "author": "bench", "content": _sentence(rng, 8), "created_at": now}
+            for i in range(start, end, 10)  # 10개 중 1개 게시글에 댓글
+        ]
+        with engine.begin() as conn:
+            conn.execute(insert(PostORM), rows)
+            conn.execute(insert(CommentORM), comments)
+    print(f"데이터 생성: 게시글 {posts}개 ({time.perf_counter() - started:.1f}s)")
+
+    from controllers import search_index
+
+    started = time.perf_counter()
+    indexed = search_index.rebuild(engine)
+    print(f"색인: 문서 {indexed}개 ({time.perf_counter() - started:.1f}s), DB 크기 {os.path.getsize(DB_PATH) / 1e6:.0f}MB")
+
+
+def _measure(fn, queries: list[str]) -> dict:
+    latencies = []
+    hits = 0
+    for q in queries:
+        started = time.perf_counter()
+        hits += len(fn(q))
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies) * 1000,
+        "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+        "avg_hits": hits / len(queries),
+    }
+
+
+def run(queries: int, like_queries: int, limit: int):
+    from sqlalchemy import text
+    from sqlalchemy.orm import Session
+    from database import engine
+    from controllers import search_index
+
+    rng = random.Random(7)
+    # 드문 단어 위주 + 일부 흔한 단어/두 단어 검색
+    terms = [
+        rng.choice(_RARE_WORDS) if rng.random() < 0.7
+        else rng.choice(_COMMON_WORDS) if rng.random() < 0.5
+        else f"{_word(rng)} {_word(rng)}"
+        for _ in range(queries)
+    ]
+
+    with Session(engine) as db:
+        fts = _measure(lambda q: search_index.search(db, q, limit, 0), terms)
+        like = _measure(
+            lambda q: db.execute(
+                text("SELECT id FROM posts WHERE title LIKE :p OR content LIKE :p ORDER BY id DESC LIMIT :limit"),
+                {"p": f"%{q.split()[0]}%", "limit": limit},
+            ).all(),
+            terms[:like_queries],
+        )
+
+    print(f"{'method':>8} {'p50(ms)':>9} {'p95(ms)':>9} {'hits':>6}")
+    for name, result in (("fts5", fts), ("like", like)):
+        print(f"{name:>8} {result['p50']:>9.2f} {result['p95']:>9.2f} {result['avg_hits']:>6.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--like-queries", type=int, default=20, help="LIKE 전체 스캔은 느려서 일부만 측정")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--skip-seed", action="store_true")
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///./{DB_PATH}"
+    if not args.skip_seed:
+        if os.path.exists(DB_PATH):
+            os.remove(DB_PATH)
+        seed(args.posts)
+    run(args.queries, args.like_queries, args.limit)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# controllers/ai_batcher.py
+# 짧은 시간(window) 동안 들어온 요청을 모아 한 번에 처리하는 마이크로 배처
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+# 첫 항목을 받은 뒤 window 안에 들어온 항목을 최대 max_batch_size개까지 모은다
+def collect_batch(q, first, max_batch_size: int, window_seconds: float) -> list:
+    batch = [first]
+    deadline = time.monotonic() + window_seconds
+    while len(batch) < max_batch_size:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(q.get(timeout=remaining))
+        except queue.Empty:
+            break
+    return batch
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        process_batch: Callable[[list], list],
+        max_batch_size: int = 8,
+        window_ms: float = 10.0,
+        name: str = "micro-batcher",
+    ):
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.window_seconds = max(0.0, window_ms) / 1000
+        self.name = name
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+    # 항목 하나를 등록하고, 배치 처리 후 결과가 채워질 Future를 돌려준다
+    def submit(self, item) -> Future:
+        self.start()
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+
+            batch = collect_batch(self._queue, first, self.max_batch_size, self.window_seconds)
+            stop_requested = _STOP in batch
+            jobs = [job for job in batch if job is not _STOP]
+            try:
+                self._process(jobs)
+            except Exception:
+                # 배치 하나가 실패해도 스레드는 계속 다음 요청을 처리
+                logger.exception("배치 처리 중 예외 (size=%d)", len(jobs))
+
+            if stop_requested:
+                return
+
+    def _process(self, jobs: list):
+        # 타임아웃으로 이미 취소된 요청은 빼고, 나머지는 실행 중으로 표시해 더 이상 취소되지 않게
+        jobs = [(item, future) for item, future in jobs if future.set_running_or_notify_cancel()]
+        if not jobs:
+            return
+
+        items = [item for item, _ in jobs]
+        try:
+            results = self.process_batch(items)
+        except Exception as e:
+            logger.exception("배치 처리 실패 (size=%d)", len(items))
+            for _, future in jobs:
+                future.set_exception(e)
+            return
+
+        for (_, future), result in zip(jobs, results):
+            future.set_result(result)
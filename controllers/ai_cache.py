@@ -0,0 +1,101 @@
+# controllers/ai_cache.py
+# 정규화된 프롬프트 해시를 키로 하는 AI 댓글 LRU/TTL 캐시
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+def prompt_key(prompt: str) -> str:
+    normalized = " ".join(unicodedata.normalize("NFC", prompt).split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class CommentCache:
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 3600, path: str | None = None):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        # key -> (comment, 만료 시각(epoch))
+        self._items: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None or item[1] <= time.time():
+                if item is not None:
+                    del self._items[key]
+                self.misses += 1
+                return None
+
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def set(self, key: str, comment: str):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._items[key] = (comment, time.time() + self.ttl_seconds)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._items),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+    # -------------------------------
+    # 디스크 저장/복원 (path 설정 시)
+    # -------------------------------
+    def load(self):
+        if not self.enabled or not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            logger.warning("AI 댓글 캐시 파일을 읽지 못했습니다: %s", self.path)
+            return
+
+        now = time.time()
+        with self._lock:
+            for key, (comment, expires_at) in data.items():
+                if expires_at > now:
+                    self._items[key] = (comment, expires_at)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def save(self):
+        if not self.enabled or not self.path:
+            return
+        with self._lock:
+            data = dict(self._items)
+
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            logger.warning("AI 댓글 캐시 파일을 저장하지 못했습니다: %s", self.path)
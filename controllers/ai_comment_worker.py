@@ -0,0 +1,250 @@
+# controllers/ai_comment_worker.py
+# 게시글 작성 요청과 분리된 AI 자동 댓글 백그라운드 작업 큐
+# - 스레드 여러 개가 동시에 생성을 요청해야 추론 엔진의 마이크로 배칭이 묶을 수 있다
+# - 생성 전에 게시글을 processing으로 선점(lease)하므로 여러 프로세스가 같은 게시글을 등록해도 생성은 한 번
+# - 큐는 메모리에만 있으므로 pending 게시글과 lease가 만료된 게시글을 주기적으로 다시 등록한다
+#   (서버 재시작, 큐가 가득 차서 등록하지 못한 경우, 생성 중 프로세스가 죽은 경우)
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+from database import SessionLocal
+from models.ai_model import CommentGenRequest
+from models.comment_model import CommentCreate
+from models.post_model import PostORM
+from controllers.ai_controller import AI_MAX_BATCH_SIZE, generate_comment
+from controllers.comment_controller import add_comment
+
+logger = logging.getLogger(__name__)
+
+AI_COMMENT_AUTHOR = "AI Bot"
+AI_JOB_QUEUE_SIZE = int(os.getenv("AI_JOB_QUEUE_SIZE", "1000"))
+# 동시에 생성 요청을 보내는 스레드 수 (기본: 배치 크기만큼)
+AI_COMMENT_WORKERS = max(1, int(os.getenv("AI_COMMENT_WORKERS", str(AI_MAX_BATCH_SIZE))))
+# 선점 후 이 시간(초)이 지나도 끝나지 않으면 다른 프로세스가 다시 가져간다
+AI_COMMENT_LEASE_SECONDS = float(os.getenv("AI_COMMENT_LEASE_SECONDS", "300"))
+# pending / lease 만료 게시글 재등록 주기(초)
+AI_COMMENT_RESCAN_SECONDS = float(os.getenv("AI_COMMENT_RESCAN_SECONDS", "60"))
+
+# posts.ai_comment_status 값
+STATUS_PENDING = "pending"
+STATUS_PROCESSING = "processing"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+_STOP = object()
+_jobs: queue.Queue = queue.Queue(maxsize=AI_JOB_QUEUE_SIZE)
+_workers: list[threading.Thread] = []
+_rescanner: threading.Thread | None = None
+_stop_event = threading.Event()
+# 이 프로세스 큐에 들어 있는 게시글 (재등록 시 중복 방지)
+_queued: set[int] = set()
+_lock = threading.Lock()
+
+
+def start():
+    global _workers, _rescanner
+    with _lock:
+        if _workers:
+            return
+        _stop_event.clear()
+        _workers = [
+            threading.Thread(target=_run, name=f"ai-comment-worker-{i}", daemon=True)
+            for i in range(AI_COMMENT_WORKERS)
+        ]
+        for worker in _workers:
+            worker.start()
+        _rescanner = threading.Thread(target=_rescan_loop, name="ai-comment-rescan", daemon=True)
+        _rescanner.start()
+
+
+def stop(timeout: float = 5.0):
+    global _workers, _rescanner
+    with _lock:
+        workers, _workers = _workers, []
+        rescanner, _rescanner = _rescanner, None
+    if not workers:
+        return
+    _stop_event.set()
+    for _ in workers:
+        _jobs.put(_STOP)
+    deadline = time.monotonic() + timeout
+    for thread in workers + [rescanner]:
+        thread.join(max(0.0, deadline - time.monotonic()))
+
+
+# 작업 등록 (큐가 가득 차면 False, 게시글은 pending으로 남아 다음 재등록 때 처리)
+def enqueue(post_id: int, title: str, content: str) -> bool:
+    start()
+    with _lock:
+        if post_id in _queued:
+            return True
+        try:
+            _jobs.put_nowait((post_id, title, content))
+        except queue.Full:
+            logger.warning("AI 댓글 작업 큐가 가득 찼습니다. post_id=%s", post_id)
+            return False
+        _queued.add(post_id)
+    return True
+
+
+# pending 게시글과 lease가 만료된 processing 게시글을 큐의 빈 자리만큼 다시 등록
+def requeue_pending() -> int:
+    with _lock:
+        free = AI_JOB_QUEUE_SIZE - len(_queued)
+        queued = len(_queued)
+    if free <= 0:
+        return 0
+
+    expired = datetime.now() - timedelta(seconds=AI_COMMENT_LEASE_SECONDS)
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(PostORM.id, PostORM.title, PostORM.content)
+            .filter(
+                or_(
+                    PostORM.ai_comment_status == STATUS_PENDING,
+                    and_(
+                        PostORM.ai_comment_status == STATUS_PROCESSING,
+                        PostORM.ai_comment_claimed_at < expired,
+                    ),
+                )
+            )
+            .order_by(PostORM.id.asc())
+            # 이미 큐에 있는 게시글도 조회될 수 있으므로 그만큼 더
+            .limit(free + queued)
+            .all()
+        )
+    except Exception:
+        # DB 오류 시 다음 주기에 다시 시도
+        logger.exception("pending 상태 AI 댓글 작업 조회 실패")
+        return 0
+    finally:
+        db.close()
+
+    count = 0
+    for post_id, title, content in rows:
+        with _lock:
+            if post_id in _queued:
+                continue
+        if not enqueue(post_id, title, content):
+            break
+        count += 1
+    if count:
+        logger.info("pending 상태 AI 댓글 작업 %s건을 다시 등록했습니다.", count)
+    return count
+
+
+def _rescan_loop():
+    while True:
+        requeue_pending()
+        if _stop_event.wait(AI_COMMENT_RESCAN_SECONDS):
+            return
+
+
+def _run():
+    while True:
+        job = _jobs.get()
+        try:
+            if job is _STOP:
+                return
+            _process(*job)
+        finally:
+            if job is not _STOP:
+                with _lock:
+                    _queued.discard(job[0])
+            _jobs.task_done()
+
+
+# pending(또는 lease 만료) 게시글을 processing으로 선점, 성공하면 선점 시각을 돌려준다
+# MySQL DATETIME은 소수 초를 버리므로 초 단위로 저장하고 비교한다
+def _claim(db, post_id: int) -> datetime | None:
+    now = datetime.now().replace(microsecond=0)
+    expired = now - timedelta(seconds=AI_COMMENT_LEASE_SECONDS)
+    claimed = (
+        db.query(PostORM)
+        .filter(
+            PostORM.id == post_id,
+            or_(
+                PostORM.ai_comment_status == STATUS_PENDING,
+                and_(
+                    PostORM.ai_comment_status == STATUS_PROCESSING,
+                    PostORM.ai_comment_claimed_at < expired,
+                ),
+            ),
+        )
+        .update(
+            {PostORM.ai_comment_status: STATUS_PROCESSING, PostORM.ai_comment_claimed_at: now},
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+    return now if claimed else None
+
+
+# 이 작업이 선점한 상태 그대로일 때만 (lease 만료 후 다른 프로세스가 가져갔으면 0건)
+def _owned(post_id: int, claimed_at: datetime):
+    return and_(
+        PostORM.id == post_id,
+        PostORM.ai_comment_status == STATUS_PROCESSING,
+        PostORM.ai_comment_claimed_at == claimed_at,
+    )
+
+
+def _process(post_id: int, title: str, content: str):
+    db = SessionLocal()
+    claimed_at = None
+    try:
+        # 다른 프로세스가 처리 중/완료했거나 삭제된 게시글은 생성하지 않음
+        claimed_at = _claim(db, post_id)
+        if claimed_at is None:
+            return
+
+        ai_request = CommentGenRequest(post_title=title, post_content=content)
+        ai_comment_text = generate_comment(ai_request)["comment"]
+
+        # done으로 바꾸고 댓글과 같은 트랜잭션에서 커밋
+        finished = (
+            db.query(PostORM)
+            .filter(_owned(post_id, claimed_at))
+            .update({PostORM.ai_comment_status: STATUS_DONE}, synchronize_session=False)
+        )
+        if not finished:
+            db.rollback()
+            return
+
+        ai_comment = CommentCreate(author=AI_COMMENT_AUTHOR, content=ai_comment_text)
+        add_comment(db, post_id, ai_comment)
+
+    except HTTPException as e:
+        # 생성 도중 게시글이 삭제된 경우 등
+        logger.warning("AI 댓글 생성 실패 post_id=%s: %s", post_id, e.detail)
+        _set_failed(db, post_id, claimed_at)
+
+    except Exception:
+        logger.exception("AI 댓글 생성 중 오류 post_id=%s", post_id)
+        _set_failed(db, post_id, claimed_at)
+
+    finally:
+        db.close()
+
+
+# 선점하지 못한 채 실패했으면 pending으로 두어 다음 재등록 때 다시 시도
+def _set_failed(db, post_id: int, claimed_at: datetime | None):
+    try:
+        db.rollback()
+        if claimed_at is None:
+            return
+        db.query(PostORM).filter(_owned(post_id, claimed_at)).update(
+            {PostORM.ai_comment_status: STATUS_FAILED}, synchronize_session=False
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("AI 댓글 상태 저장 실패 post_id=%s", post_id)
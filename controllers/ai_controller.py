@@ -1,51 +1,93 @@
+import json
+import os
+from typing import Iterator
+
 from fastapi import HTTPException
-from transformers import AutoTokenizer, AutoModelForCausalLM
 from models.ai_model import CommentGenRequest
-import torch
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from controllers.ai_cache import CommentCache, prompt_key
+from controllers.ai_inference import LocalInference, MODEL_NAME, AI_MODEL_BACKEND
+from controllers.ai_worker_pool import InferenceWorkerPool
 
-# 한국어 KoGPT-2 로드 (무료 + 로컬)
-try:
-    tokenizer = AutoTokenizer.from_pretrained("skt/kogpt2-base-v2")
-    model = AutoModelForCausalLM.from_pretrained("skt/kogpt2-base-v2")
-except Exception as e:
-    raise RuntimeError(f"AI 모델 로딩 실패: {e}")
+# 마이크로 배칭 설정 (AI_MAX_BATCH_SIZE=1 이면 요청마다 개별 생성)
+AI_BATCH_WINDOW_MS = float(os.getenv("AI_BATCH_WINDOW_MS", "10"))
+AI_MAX_BATCH_SIZE = int(os.getenv("AI_MAX_BATCH_SIZE", "8"))
+AI_GENERATE_TIMEOUT = float(os.getenv("AI_GENERATE_TIMEOUT", "60"))
 
+# 추론 워커 프로세스 설정 (0이면 웹 프로세스 안에서 직접 생성)
+AI_WORKER_PROCESSES = int(os.getenv("AI_WORKER_PROCESSES", "1"))
+AI_TORCH_THREADS = int(os.getenv("AI_TORCH_THREADS", "0"))  # 0 = torch 기본값
 
-def generate_comment(data: CommentGenRequest):
-    try:
-        # 요청값 검증
-        if not data.post_title.strip():
-            raise HTTPException(status_code=400, detail="제목이 비어 있습니다.")
-        if not data.post_content.strip():
-            raise HTTPException(status_code=400, detail="내용이 비어 있습니다.")
-
-        # 프롬프트 생성
-        prompt = (
-            f"제목: {data.post_title}\n"
-            f"내용: {data.post_content}\n\n"
-            "위 글에 자연스럽게 달릴 한국어 댓글 한 줄을 작성하세요:"
-        )
 
-        # 토크나이징
-        inputs = tokenizer(prompt, return_tensors="pt")
+# 생성 결과 캐시 (AI_CACHE_SIZE=0 이면 사용 안 함)
+AI_CACHE_SIZE = int(os.getenv("AI_CACHE_SIZE", "1024"))
+AI_CACHE_TTL = float(os.getenv("AI_CACHE_TTL", "3600"))
+AI_CACHE_PATH = os.getenv("AI_CACHE_PATH")  # 지정 시 재시작해도 캐시 유지
+
+comment_cache = CommentCache(max_size=AI_CACHE_SIZE, ttl_seconds=AI_CACHE_TTL, path=AI_CACHE_PATH)
 
-        # 출력 토큰 개수(max_new_tokens)만 조절하면 안전함
-        outputs = model.generate(
-            **inputs,
-            max_new_tokens=60,
-            do_sample=True,
-            top_k=50,
-            temperature=0.8
+
+def _create_engine():
+    if AI_WORKER_PROCESSES > 0:
+        return InferenceWorkerPool(
+            processes=AI_WORKER_PROCESSES,
+            torch_threads=AI_TORCH_THREADS,
+            max_batch_size=AI_MAX_BATCH_SIZE,
+            window_ms=AI_BATCH_WINDOW_MS,
         )
+    return LocalInference(max_batch_size=AI_MAX_BATCH_SIZE, window_ms=AI_BATCH_WINDOW_MS)
+
+
+_engine = _create_engine()
+
+WARMUP_REQUEST = CommentGenRequest(
+    post_title="안녕하세요", post_content="워밍업용 게시글입니다.", use_cache=False
+)
+
 
-        text = tokenizer.decode(outputs[0], skip_special_tokens=True)
+def _build_prompt(data: CommentGenRequest) -> str:
+    # 요청값 검증
+    if not data.post_title.strip():
+        raise HTTPException(status_code=400, detail="제목이 비어 있습니다.")
+    if not data.post_content.strip():
+        raise HTTPException(status_code=400, detail="내용이 비어 있습니다.")
 
-        # 프롬프트 이후의 결과만 추출
-        if "작성하세요:" in text:
-            text = text.split("작성하세요:")[1].strip()
+    # 프롬프트 생성
+    return (
+        f"제목: {data.post_title}\n"
+        f"내용: {data.post_content}\n\n"
+        "위 글에 자연스럽게 달릴 한국어 댓글 한 줄을 작성하세요:"
+    )
+
+
+def _sse(event: str, payload: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+def generate_comment(data: CommentGenRequest):
+    try:
+        prompt = _build_prompt(data)
+
+        cache_key = prompt_key(prompt)
+        if data.use_cache and comment_cache.enabled:
+            cached = comment_cache.get(cache_key)
+            if cached is not None:
+                return {"comment": cached}
+
+        # 추론 엔진에서 동시 요청과 묶어서 생성
+        # 결과는 프롬프트 이후 생성된 부분만 포함
+        future = _engine.submit(prompt)
+        try:
+            text = future.result(timeout=AI_GENERATE_TIMEOUT)
+        except FutureTimeoutError:
+            future.cancel()
+            raise HTTPException(status_code=504, detail="AI 댓글 생성 시간이 초과되었습니다.")
 
         # 너무 길면 한 줄만 남기기
-        text = text.split("\n")[0].strip()
+        text = text.strip().split("\n")[0].strip()
+
+        if text:
+            comment_cache.set(cache_key, text)
 
         return {"comment": text}
 
@@ -54,3 +96,68 @@ def generate_comment(data: CommentGenRequest):
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AI 모델 오류: {str(e)}")
+
+
+# -------------------------------
+# 스트리밍 생성 (Server-Sent Events)
+# -------------------------------
+def stream_comment(data: CommentGenRequest) -> Iterator[str]:
+    # 검증 오류는 스트림 시작 전에 HTTP 에러로 응답
+    prompt = _build_prompt(data)
+    cache_key = prompt_key(prompt)
+
+    cached = comment_cache.get(cache_key) if data.use_cache and comment_cache.enabled else None
+    return _stream_events(prompt, cache_key, cached)
+
+
+def _stream_events(prompt: str, cache_key: str, cached: str | None) -> Iterator[str]:
+    if cached is not None:
+        yield _sse("token", {"token": cached})
+        yield _sse("done", {"comment": cached})
+        return
+
+    pieces = []
+    try:
+        for piece in _engine.stream(prompt):
+            pieces.append(piece)
+            yield _sse("token", {"token": piece})
+    except Exception as e:
+        yield _sse("error", {"detail": f"AI 모델 오류: {str(e)}"})
+        return
+
+    text = "".join(pieces).strip()
+    if text:
+        comment_cache.set(cache_key, text)
+    yield _sse("done", {"comment": text})
+
+
+# 모델 로드 + 더미 생성 1회 (서버 시작 시 선택적으로 호출)
+def warmup():
+    generate_comment(WARMUP_REQUEST)
+
+
+# 서버 시작 시 캐시만 불러온다
+# 추론 워커(모델 로딩)는 첫 생성 요청 또는 AI_WARMUP 워밍업 때 시작
+def startup():
+    comment_cache.load()
+
+
+# 서버 종료 시 추론 워커 정리
+def shutdown():
+    _engine.stop()
+    comment_cache.save()
+
+
+# 캐시 적중률
+def get_cache_stats():
+    return comment_cache.stats()
+
+
+# 모델 준비 상태
+def get_readiness():
+    return {
+        "model": MODEL_NAME,
+        "backend": AI_MODEL_BACKEND,
+        "loaded": _engine.is_ready(),
+        **_engine.status(),
+    }
@@ -0,0 +1,219 @@
+# controllers/ai_inference.py
+# KoGPT-2 모델 로딩 및 추론
+# transformers/torch는 실제로 모델이 필요할 때 처음 import 한다.
+import os
+import threading
+from concurrent.futures import Future
+from typing import Iterator
+
+from controllers.ai_batcher import MicroBatcher
+
+MODEL_NAME = os.getenv("AI_MODEL_NAME", "skt/kogpt2-base-v2")
+
+# 추론 백엔드: eager(fp32 기본) / int8(동적 양자화) / onnx(onnxruntime, optimum 필요)
+AI_MODEL_BACKEND = os.getenv("AI_MODEL_BACKEND", "eager")
+
+# 출력 토큰 개수(max_new_tokens)만 조절하면 안전함
+GENERATION_KWARGS = {
+    "max_new_tokens": 60,
+    "do_sample": True,
+    "top_k": 50,
+    "temperature": 0.8,
+}
+
+
+# -------------------------------
+# 추론 백엔드별 모델 로더
+# -------------------------------
+def _load_eager(model_name: str):
+    from transformers import AutoModelForCausalLM
+
+    return AutoModelForCausalLM.from_pretrained(model_name)
+
+
+# GPT-2의 Conv1D(가중치가 전치된 Linear)를 nn.Linear로 바꿔 양자화 대상이 되게 한다
+def _conv1d_to_linear(module):
+    from torch import nn
+    from transformers.pytorch_utils import Conv1D
+
+    for name, child in module.named_children():
+        if isinstance(child, Conv1D):
+            in_features, out_features = child.weight.shape
+            linear = nn.Linear(in_features, out_features)
+            linear.weight.data = child.weight.data.t().contiguous()
+            linear.bias.data = child.bias.data
+            setattr(module, name, linear)
+        else:
+            _conv1d_to_linear(child)
+
+
+def _load_int8(model_name: str):
+    import torch
+
+    model = _load_eager(model_name)
+    _conv1d_to_linear(model)
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _load_onnx(model_name: str):
+    try:
+        from optimum.onnxruntime import ORTModelForCausalLM
+    except ImportError:
+        raise RuntimeError("onnx 백엔드를 쓰려면 optimum[onnxruntime] 설치가 필요합니다.")
+
+    # KV 캐시를 포함한 그래프로 export
+    return ORTModelForCausalLM.from_pretrained(model_name, export=True, use_cache=True)
+
+
+MODEL_BACKENDS = {
+    "eager": _load_eager,
+    "int8": _load_int8,
+    "onnx": _load_onnx,
+}
+
+
+class ModelLoader:
+    def __init__(self, model_name: str = MODEL_NAME, backend: str = AI_MODEL_BACKEND):
+        self.model_name = model_name
+        self.backend = backend
+        self._tokenizer = None
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._model is not None
+
+    # 최초 호출 시 한 번만 로드 (동시 호출은 락으로 직렬화)
+    def load(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    from transformers import AutoTokenizer
+
+                    load_model = MODEL_BACKENDS.get(self.backend)
+                    if load_model is None:
+                        raise RuntimeError(f"지원하지 않는 AI_MODEL_BACKEND: {self.backend}")
+
+                    try:
+                        tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+                        model = load_model(self.model_name)
+                    except Exception as e:
+                        raise RuntimeError(f"AI 모델 로딩 실패: {e}")
+
+                    # 배치 생성을 위해 왼쪽 패딩 (KoGPT-2는 pad 토큰이 없어 eos로 대체)
+                    if tokenizer.pad_token is None:
+                        tokenizer.pad_token = tokenizer.eos_token
+                    tokenizer.padding_side = "left"
+
+                    # onnxruntime 모델은 eval 모드 개념이 없음
+                    if hasattr(model, "eval"):
+                        model.eval()
+                    self._tokenizer = tokenizer
+                    self._model = model
+
+        return self._tokenizer, self._model
+
+
+model_loader = ModelLoader()
+
+
+# 댓글은 첫 줄만 사용하므로, 각 행이 (앞쪽 공백 이후) 줄바꿈을 만들면 생성을 멈춘다
+def _newline_stopping_criteria(tokenizer, prompt_length: int):
+    import torch
+    from transformers import StoppingCriteria, StoppingCriteriaList
+
+    class NewlineStoppingCriteria(StoppingCriteria):
+        def __call__(self, input_ids, scores, **kwargs):
+            texts = tokenizer.batch_decode(input_ids[:, prompt_length:], skip_special_tokens=True)
+            done = ["\n" in text.lstrip() for text in texts]
+            return torch.tensor(done, dtype=torch.bool, device=input_ids.device)
+
+    return StoppingCriteriaList([NewlineStoppingCriteria()])
+
+
+# 여러 프롬프트를 패딩해 한 번의 generate로 처리하고, 프롬프트 이후 생성된 부분만 돌려준다
+def generate_texts(prompts: list[str]) -> list[str]:
+    tokenizer, model = model_loader.load()
+
+    # 토크나이징
+    inputs = tokenizer(prompts, return_tensors="pt", padding=True)
+    prompt_length = inputs["input_ids"].shape[1]
+
+    outputs = model.generate(
+        **inputs,
+        **GENERATION_KWARGS,
+        pad_token_id=tokenizer.pad_token_id,
+        stopping_criteria=_newline_stopping_criteria(tokenizer, prompt_length),
+    )
+
+    return tokenizer.batch_decode(outputs[:, prompt_length:], skip_special_tokens=True)
+
+
+# 생성되는 토큰을 바로 돌려주고, 첫 줄이 끝나면 멈춘다
+def stream_text(prompt: str) -> Iterator[str]:
+    from transformers import TextIteratorStreamer
+
+    tokenizer, model = model_loader.load()
+    inputs = tokenizer(prompt, return_tensors="pt")
+    prompt_length = inputs["input_ids"].shape[1]
+
+    streamer = TextIteratorStreamer(tokenizer, skip_prompt=True, skip_special_tokens=True)
+    generation = threading.Thread(
+        target=model.generate,
+        kwargs={
+            **inputs,
+            **GENERATION_KWARGS,
+            "pad_token_id": tokenizer.pad_token_id,
+            "stopping_criteria": _newline_stopping_criteria(tokenizer, prompt_length),
+            "streamer": streamer,
+        },
+        daemon=True,
+    )
+    generation.start()
+
+    started = False
+    for piece in streamer:
+        # 앞쪽 공백/줄바꿈은 건너뛰고, 본문 이후 첫 줄바꿈에서 종료
+        if not started:
+            piece = piece.lstrip()
+            if not piece:
+                continue
+            started = True
+
+        line, newline, _ = piece.partition("\n")
+        if line:
+            yield line
+        if newline:
+            break
+
+    generation.join()
+
+
+# 웹 프로세스 안에서 직접 생성하는 추론 엔진 (AI_WORKER_PROCESSES=0, 개발용)
+class LocalInference:
+    def __init__(self, max_batch_size: int = 8, window_ms: float = 10.0):
+        self._batcher = MicroBatcher(
+            generate_texts,
+            max_batch_size=max_batch_size,
+            window_ms=window_ms,
+            name="ai-batcher",
+        )
+
+    def is_ready(self) -> bool:
+        return model_loader.is_loaded
+
+    def status(self) -> dict:
+        return {"processes": 0}
+
+    def start(self):
+        self._batcher.start()
+
+    def stop(self):
+        self._batcher.stop()
+
+    def submit(self, prompt: str) -> Future:
+        return self._batcher.submit(prompt)
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        return stream_text(prompt)
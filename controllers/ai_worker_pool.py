@@ -0,0 +1,354 @@
+# controllers/ai_worker_pool.py
+# KoGPT-2 모델을 별도 프로세스에서 실행하는 추론 워커 풀
+# 웹 프로세스는 이 모듈만 사용하며 torch/transformers를 import 하지 않는다.
+#
+# 워커마다 요청/결과 파이프를 따로 두고, 요청은 처리 중인 작업이 가장 적은 워커로 보낸다.
+# (공유 큐는 워커가 큐 락을 잡은 채 죽으면 다른 워커까지 멈추므로 사용하지 않음)
+# 워커가 죽으면 그 워커에 보낸 요청만 실패 처리하고 다시 띄운다.
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from multiprocessing.connection import wait
+from typing import Iterator
+
+from controllers.ai_batcher import collect_batch
+
+logger = logging.getLogger(__name__)
+
+# 워커 프로세스 생존 확인 주기(초)
+HEALTH_CHECK_SECONDS = 1.0
+# 시작 직후 계속 죽는 워커(모델 로딩 실패 등)는 재시작 간격을 두 배씩 늘린다
+RESTART_BACKOFF_MAX_SECONDS = 60.0
+# 이 시간(초) 이상 살아 있다가 죽은 워커는 바로 재시작
+RESTART_STABLE_SECONDS = 30.0
+
+_WORKER_LOST = "추론 워커가 비정상 종료되었습니다."
+
+
+class _WorkerSlot:
+    def __init__(self, index: int):
+        self.index = index
+        self.process = None
+        self.jobs = None  # 웹 → 워커
+        self.results = None  # 워커 → 웹
+        self.send_lock = threading.Lock()
+        self.assigned: set[int] = set()
+        self.spawned_at = 0.0
+        self.backoff = 0.0
+        self.restart_at: float | None = None
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.restart_at is None
+
+
+class InferenceWorkerPool:
+    def __init__(
+        self,
+        processes: int = 1,
+        torch_threads: int = 0,
+        max_batch_size: int = 8,
+        window_ms: float = 10.0,
+    ):
+        self.processes = max(1, processes)
+        self.torch_threads = torch_threads
+        self.max_batch_size = max_batch_size
+        self.window_ms = window_ms
+
+        self._ctx = multiprocessing.get_context("spawn")
+        self._slots: list[_WorkerSlot] = []
+        self._dispatcher: threading.Thread | None = None
+        self._stopping = False
+        self._pending: dict[int, Future] = {}
+        self._streams: dict[int, queue.Queue] = {}
+        self._ready_pids: set[int] = set()
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+    @property
+    def started(self) -> bool:
+        return bool(self._slots)
+
+    def is_ready(self) -> bool:
+        return len(self._ready_pids) >= self.processes
+
+    def status(self) -> dict:
+        return {
+            "processes": self.processes,
+            "ready_processes": len(self._ready_pids),
+            "alive_processes": sum(slot.alive for slot in self._slots),
+            "pending": len(self._pending),
+            "streaming": len(self._streams),
+        }
+
+    def _spawn(self, slot: _WorkerSlot):
+        jobs_reader, jobs_writer = self._ctx.Pipe(duplex=False)
+        results_reader, results_writer = self._ctx.Pipe(duplex=False)
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(jobs_reader, results_writer, self.torch_threads, self.max_batch_size, self.window_ms),
+            name=f"ai-inference-{slot.index}",
+            daemon=True,
+        )
+        process.start()
+        # 자식 쪽 끝은 닫아야 자식이 죽었을 때 EOF를 받는다
+        jobs_reader.close()
+        results_writer.close()
+        slot.process, slot.jobs, slot.results = process, jobs_writer, results_reader
+        slot.spawned_at = time.monotonic()
+        slot.restart_at = None
+
+    # 첫 submit/stream 때 호출된다 (서버 시작 시 모델을 미리 올리지 않음)
+    def start(self):
+        with self._lock:
+            if self._slots:
+                return
+
+            self._stopping = False
+            self._slots = [_WorkerSlot(index) for index in range(self.processes)]
+            for slot in self._slots:
+                self._spawn(slot)
+
+            self._dispatcher = threading.Thread(
+                target=self._dispatch, name="ai-inference-dispatcher", daemon=True
+            )
+            self._dispatcher.start()
+
+    def stop(self, timeout: float = 5.0):
+        with self._lock:
+            slots, self._slots = self._slots, []
+            if not slots:
+                return
+            self._stopping = True
+
+        for slot in slots:
+            if slot.alive:
+                try:
+                    with slot.send_lock:
+                        slot.jobs.send(None)
+                except OSError:
+                    pass
+        for slot in slots:
+            slot.process.join(timeout)
+            if slot.process.is_alive():
+                slot.process.terminate()
+
+        if self._dispatcher is not None:
+            self._dispatcher.join(timeout)
+            self._dispatcher = None
+        for slot in slots:
+            slot.jobs.close()
+            slot.results.close()
+        self._ready_pids.clear()
+
+        for job_id in list(self._pending) + list(self._streams):
+            self._fail(job_id, "추론 워커가 종료되었습니다.")
+
+    # 처리 중인 요청이 가장 적은 살아 있는 워커로 전송
+    def _send(self, job_id: int, prompt: str, stream: bool):
+        self.start()
+        with self._lock:
+            live = [slot for slot in self._slots if slot.alive]
+            if not live:
+                raise RuntimeError("추론 워커를 다시 시작하는 중입니다.")
+            slot = min(live, key=lambda s: len(s.assigned))
+            slot.assigned.add(job_id)
+        try:
+            with slot.send_lock:
+                slot.jobs.send((job_id, prompt, stream))
+        except OSError:
+            slot.assigned.discard(job_id)
+            raise RuntimeError(_WORKER_LOST)
+
+    # 프롬프트를 워커 프로세스로 보내고 결과를 받을 Future를 돌려준다
+    def submit(self, prompt: str) -> Future:
+        job_id = next(self._ids)
+        future: Future = Future()
+        self._pending[job_id] = future
+        # 호출 측에서 타임아웃 후 cancel() 하면 대기 목록에서 제거
+        future.add_done_callback(lambda _: self._pending.pop(job_id, None))
+        try:
+            self._send(job_id, prompt, False)
+        except RuntimeError as e:
+            future.set_exception(e)
+        return future
+
+    # 워커가 생성하는 토큰 조각을 순서대로 돌려준다
+    def stream(self, prompt: str, timeout: float = 60.0) -> Iterator[str]:
+        job_id = next(self._ids)
+        pieces: queue.Queue = queue.Queue()
+        self._streams[job_id] = pieces
+
+        try:
+            self._send(job_id, prompt, True)
+            while True:
+                kind, value = pieces.get(timeout=timeout)
+                if kind == "end":
+                    return
+                if kind == "error":
+                    raise RuntimeError(value)
+                yield value
+        finally:
+            self._streams.pop(job_id, None)
+
+    def _fail(self, job_id: int, message: str):
+        stream = self._streams.get(job_id)
+        if stream is not None:
+            stream.put(("error", message))
+            return
+        future = self._pending.get(job_id)
+        if future is not None:
+            try:
+                future.set_exception(RuntimeError(message))
+            except InvalidStateError:
+                # 타임아웃으로 이미 취소된 요청
+                pass
+
+    def _deliver(self, slot: _WorkerSlot, message):
+        kind, key, value = message
+        if kind == "ready":
+            self._ready_pids.add(key)
+            return
+        if kind != "token":
+            slot.assigned.discard(key)
+
+        stream = self._streams.get(key)
+        if stream is not None:
+            stream.put((kind, value))
+            return
+
+        future = self._pending.get(key)
+        if future is None:
+            return
+        try:
+            if kind == "ok":
+                future.set_result(value)
+            else:
+                future.set_exception(RuntimeError(value))
+        except InvalidStateError:
+            # 타임아웃으로 이미 취소된 요청
+            pass
+
+    # 죽은 워커에 보낸 요청은 실패 처리하고, 대기 시간이 지나면 다시 띄운다
+    def _handle_dead(self, slot: _WorkerSlot, now: float):
+        if slot.restart_at is None:
+            self._ready_pids.discard(slot.process.pid)
+            lost, slot.assigned = slot.assigned, set()
+            for job_id in lost:
+                self._fail(job_id, _WORKER_LOST)
+            slot.jobs.close()
+            slot.results.close()
+
+            if now - slot.spawned_at < RESTART_STABLE_SECONDS:
+                slot.backoff = min(max(slot.backoff * 2, 1.0), RESTART_BACKOFF_MAX_SECONDS)
+            else:
+                slot.backoff = 0.0
+            slot.restart_at = now + slot.backoff
+            logger.error(
+                "추론 워커 %s 종료됨 (exitcode=%s), %.0f초 후 다시 시작합니다.",
+                slot.process.name, slot.process.exitcode, slot.backoff,
+            )
+
+        if now >= slot.restart_at:
+            self._spawn(slot)
+
+    # 워커 프로세스의 결과를 각 Future로 전달 + 워커 생존 확인
+    def _dispatch(self):
+        while not self._stopping:
+            with self._lock:
+                slots = list(self._slots)
+            live = [slot for slot in slots if slot.alive]
+
+            ready = wait([slot.results for slot in live], timeout=HEALTH_CHECK_SECONDS) if live else []
+            if not live:
+                time.sleep(HEALTH_CHECK_SECONDS)
+
+            for slot in live:
+                if slot.results not in ready:
+                    continue
+                try:
+                    while slot.results.poll():
+                        self._deliver(slot, slot.results.recv())
+                except (EOFError, OSError):
+                    # 워커 종료 (아래에서 처리)
+                    pass
+
+            if self._stopping:
+                return
+            now = time.monotonic()
+            with self._lock:
+                for slot in self._slots:
+                    if not slot.alive or not slot.process.is_alive():
+                        self._handle_dead(slot, now)
+
+
+# -------------------------------
+# 워커 프로세스 본체
+# -------------------------------
+# 파이프에서 요청을 계속 읽어 로컬 큐에 넣는다 (생성 중에도 웹 프로세스의 send가 막히지 않게)
+def _pump_requests(conn, local_queue: queue.Queue):
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            job = None
+        local_queue.put(job)
+        if job is None:
+            return
+
+
+def _worker_main(jobs_conn, results_conn, torch_threads: int, max_batch_size: int, window_ms: float):
+    if torch_threads > 0:
+        os.environ["OMP_NUM_THREADS"] = str(torch_threads)
+        os.environ["MKL_NUM_THREADS"] = str(torch_threads)
+        import torch
+
+        torch.set_num_threads(torch_threads)
+
+    from controllers.ai_inference import model_loader, generate_texts, stream_text
+
+    requests: queue.Queue = queue.Queue()
+    threading.Thread(target=_pump_requests, args=(jobs_conn, requests), daemon=True).start()
+
+    try:
+        model_loader.load()
+        results_conn.send(("ready", os.getpid(), None))
+    except Exception:
+        # 로딩 실패 시에도 요청마다 다시 시도하고 오류를 돌려준다
+        logger.exception("추론 워커 모델 로딩 실패")
+
+    window_seconds = max(0.0, window_ms) / 1000
+    while True:
+        first = requests.get()
+        if first is None:
+            return
+
+        batch = collect_batch(requests, first, max_batch_size, window_seconds)
+        jobs = [job for job in batch if job is not None and not job[2]]
+        stream_jobs = [job for job in batch if job is not None and job[2]]
+
+        if jobs:
+            try:
+                texts = generate_texts([prompt for _, prompt, _ in jobs])
+                for (job_id, _, _), text in zip(jobs, texts):
+                    results_conn.send(("ok", job_id, text))
+            except Exception as e:
+                for job_id, _, _ in jobs:
+                    results_conn.send(("error", job_id, str(e)))
+
+        # 스트리밍 요청은 배치에 묶지 않고 하나씩 처리
+        for job_id, prompt, _ in stream_jobs:
+            try:
+                for piece in stream_text(prompt):
+                    results_conn.send(("token", job_id, piece))
+                results_conn.send(("end", job_id, None))
+            except Exception as e:
+                results_conn.send(("error", job_id, str(e)))
+
+        if None in batch:
+            return
@@ -1,30 +1,75 @@
 # controllers/comment_controller.py
 from fastapi import HTTPException
+from sqlalchemy import and_, update
 from sqlalchemy.orm import Session
+from typing import TYPE_CHECKING
 
+from controllers import response_cache, search_index
+from controllers.cursor import decode_id_cursor, encode_id_cursor
 from models.comment_model import CommentORM, CommentCreate, Comment
 from models.post_model import PostORM
 from models.user_model import UserORM
 
-
-# 댓글 목록
-def get_comments(db: Session, post_id: int):
-    post = db.query(PostORM).filter(PostORM.id == post_id).first()
-    if not post:
-        raise HTTPException(404, "게시글을 찾을 수 없습니다.")
-
-    comments = (
-        db.query(CommentORM)
-        .filter(CommentORM.post_id == post_id)
+if TYPE_CHECKING:  # 비동기 모드에서만 실제로 import (greenlet 필요)
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+# 댓글 페이지네이션
+COMMENT_DEFAULT_LIMIT = 50
+COMMENT_MAX_LIMIT = 200
+
+
+# -------------------------------
+# 댓글 목록 (id 기준 커서 페이지네이션, 오래된 순)
+# -------------------------------
+# after: 이전 응답의 next_cursor (다음 페이지)
+# after_id: 클라이언트가 마지막으로 받은 댓글 id (그 이후 새 댓글만 조회)
+def get_comments(
+    db: Session,
+    post_id: int,
+    limit: int = COMMENT_DEFAULT_LIMIT,
+    after: str | None = None,
+    after_id: int | None = None,
+):
+    limit = max(1, min(limit, COMMENT_MAX_LIMIT))
+    last_seen = decode_id_cursor(after) if after else (after_id or 0)
+
+    # 게시글 존재 확인과 댓글 조회를 한 번에 (댓글이 없으면 게시글 행 1개에 댓글 NULL)
+    rows = (
+        db.query(PostORM.id, CommentORM)
+        .outerjoin(
+            CommentORM,
+            and_(CommentORM.post_id == PostORM.id, CommentORM.id > last_seen),
+        )
+        .filter(PostORM.id == post_id)
         .order_by(CommentORM.id.asc())
+        .limit(limit + 1)
         .all()
     )
+    if not rows:
+        raise HTTPException(404, "게시글을 찾을 수 없습니다.")
+
+    comments = [row.CommentORM for row in rows if row.CommentORM is not None]
+    has_next = len(comments) > limit
+    comments = comments[:limit]
+
+    return {
+        "comments": [Comment.from_orm(c) for c in comments],
+        "next_cursor": encode_id_cursor(comments[-1].id) if has_next else None,
+        # 다음 폴링 때 after_id로 그대로 전달
+        "last_id": comments[-1].id if comments else last_seen,
+    }
+
 
-    return [Comment.from_orm(c) for c in comments]
+# 쓰기 함수는 (응답, 무효화할 캐시 네임스페이스)를 돌려주고 무효화는 커밋 후 호출 측에서
+def _after_commit(outcome: tuple[dict, list[str]]) -> dict:
+    result, namespaces = outcome
+    response_cache.invalidate(*namespaces)
+    return result
 
 
 # 댓글 등록 (로그인 유저 기준)
-def add_comment(db: Session, post_id: int, data: CommentCreate, user: UserORM | None = None):
+def _add_comment(db: Session, post_id: int, data: CommentCreate, user: UserORM | None = None):
     post = db.query(PostORM).filter(PostORM.id == post_id).first()
     if not post:
         raise HTTPException(404, "게시글을 찾을 수 없습니다.")
@@ -38,18 +83,31 @@ def add_comment(db: Session, post_id: int, data: CommentCreate, user: UserORM |
         content=data.content,
     )
     db.add(new_comment)
+    db.flush()
+    search_index.index_comment(db, new_comment)
+    # 댓글 수는 원자적 UPDATE로 같은 트랜잭션에서 증가
+    db.execute(
+        update(PostORM)
+        .where(PostORM.id == post_id)
+        .values(comment_count=PostORM.comment_count + 1)
+    )
     db.commit()
     db.refresh(new_comment)
 
-    return {
+    result = {
         "message": "댓글이 등록되었습니다.",
         "comment": Comment.from_orm(new_comment),
     }
+    # 댓글 목록과 피드의 comment_count
+    return result, [response_cache.comments_namespace(post_id), response_cache.FEED]
+
 
+def add_comment(db: Session, post_id: int, data: CommentCreate, user: UserORM | None = None):
+    return _after_commit(_add_comment(db, post_id, data, user))
 
 
 # 댓글 수정 (작성자만 가능)
-def update_comment(db: Session, post_id: int, comment_id: int, user: UserORM, data: dict):
+def _update_comment(db: Session, post_id: int, comment_id: int, user: UserORM, data: dict):
     comment = (
         db.query(CommentORM)
         .filter(CommentORM.id == comment_id, CommentORM.post_id == post_id)
@@ -66,14 +124,20 @@ def update_comment(db: Session, post_id: int, comment_id: int, user: UserORM, da
         raise HTTPException(400, "내용을 입력해주세요.")
 
     comment.content = new_content
+    search_index.index_comment(db, comment)
     db.commit()
     db.refresh(comment)
 
-    return {"message": "댓글이 수정되었습니다.", "comment": Comment.from_orm(comment)}
+    result = {"message": "댓글이 수정되었습니다.", "comment": Comment.from_orm(comment)}
+    return result, [response_cache.comments_namespace(post_id)]
+
+
+def update_comment(db: Session, post_id: int, comment_id: int, user: UserORM, data: dict):
+    return _after_commit(_update_comment(db, post_id, comment_id, user, data))
 
 
 # 댓글 삭제 (작성자만 가능)
-def delete_comment(db: Session, post_id: int, comment_id: int, user: UserORM):
+def _delete_comment(db: Session, post_id: int, comment_id: int, user: UserORM):
     comment = (
         db.query(CommentORM)
         .filter(CommentORM.id == comment_id, CommentORM.post_id == post_id)
@@ -85,7 +149,49 @@ def delete_comment(db: Session, post_id: int, comment_id: int, user: UserORM):
     if comment.author != user.nickname:
         raise HTTPException(403, "본인이 작성한 댓글만 삭제할 수 있습니다.")
 
+    search_index.remove_comment(db, comment.id)
     db.delete(comment)
+    db.execute(
+        update(PostORM)
+        .where(PostORM.id == post_id, PostORM.comment_count > 0)
+        .values(comment_count=PostORM.comment_count - 1)
+    )
     db.commit()
 
-    return {"message": "댓글이 삭제되었습니다."}
+    result = {"message": "댓글이 삭제되었습니다."}
+    return result, [response_cache.comments_namespace(post_id), response_cache.FEED]
+
+
+def delete_comment(db: Session, post_id: int, comment_id: int, user: UserORM):
+    return _after_commit(_delete_comment(db, post_id, comment_id, user))
+
+
+# -------------------------------
+# 비동기 버전 (DB_ASYNC=1, AsyncSession)
+# -------------------------------
+async def _after_commit_async(outcome: tuple[dict, list[str]]) -> dict:
+    result, namespaces = outcome
+    await response_cache.invalidate_async(*namespaces)
+    return result
+
+
+async def get_comments_async(
+    db: "AsyncSession",
+    post_id: int,
+    limit: int = COMMENT_DEFAULT_LIMIT,
+    after: str | None = None,
+    after_id: int | None = None,
+):
+    return await db.run_sync(get_comments, post_id, limit, after, after_id)
+
+
+async def add_comment_async(db: "AsyncSession", post_id: int, data: CommentCreate, user: UserORM | None = None):
+    return await _after_commit_async(await db.run_sync(_add_comment, post_id, data, user))
+
+
+async def update_comment_async(db: "AsyncSession", post_id: int, comment_id: int, user: UserORM, data: dict):
+    return await _after_commit_async(await db.run_sync(_update_comment, post_id, comment_id, user, data))
+
+
+async def delete_comment_async(db: "AsyncSession", post_id: int, comment_id: int, user: UserORM):
+    return await _after_commit_async(await db.run_sync(_delete_comment, post_id, comment_id, user))
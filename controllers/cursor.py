@@ -0,0 +1,26 @@
+# controllers/cursor.py
+# 목록/댓글/검색 공통 커서 (base64url로 감싼 JSON {"<필드>": 정수})
+import base64
+import json
+
+from fastapi import HTTPException
+
+# 커서 값과 after_id는 BIGINT 범위의 정수만 허용 (1e999 같은 값이나 큰 정수는 DB 바인딩 전에 거절)
+CURSOR_ID_MAX = 2**63 - 1
+
+
+def encode_id_cursor(value: int, field: str = "id") -> str:
+    raw = json.dumps({field: value}).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_id_cursor(cursor: str, field: str = "id") -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value = json.loads(base64.urlsafe_b64decode(padded))[field]
+    except (ValueError, KeyError, TypeError, OverflowError):
+        raise HTTPException(400, "잘못된 커서입니다.")
+    # bool은 int의 하위 클래스이므로 type으로 비교
+    if type(value) is not int or not 0 <= value <= CURSOR_ID_MAX:
+        raise HTTPException(400, "잘못된 커서입니다.")
+    return value
@@ -0,0 +1,138 @@
+# controllers/image_derivatives.py
+# 업로드 이미지의 축소본(WebP) 생성 파이프라인
+# 리사이즈는 CPU 작업이므로 별도 프로세스 풀에서 처리하고, 요청은 기다리지 않는다.
+# 끝나면 posts.image_thumb에 피드용 썸네일 URL을 저장한다. (Pillow 필요, 없으면 원본만 사용)
+import importlib.util
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from controllers import response_cache
+from database import SessionLocal
+from models.post_model import PostORM
+
+logger = logging.getLogger(__name__)
+
+IMAGE_WORKER_PROCESSES = int(os.getenv("IMAGE_WORKER_PROCESSES", "1"))
+# 생성할 가로 폭 목록, 첫 번째가 피드 썸네일
+IMAGE_DERIVATIVE_WIDTHS = [
+    int(w) for w in os.getenv("IMAGE_DERIVATIVE_WIDTHS", "320,800").split(",") if w.strip()
+]
+IMAGE_WEBP_QUALITY = int(os.getenv("IMAGE_WEBP_QUALITY", "80"))
+# 축소본 임시 파일 접두사 (숨김 파일이라 /uploads로 제공되지 않고, sweep_orphans가 정리한다)
+TMP_PREFIX = ".derive_"
+
+_executor: ProcessPoolExecutor | None = None
+_lock = threading.Lock()
+
+
+def is_enabled() -> bool:
+    return (
+        IMAGE_WORKER_PROCESSES > 0
+        and bool(IMAGE_DERIVATIVE_WIDTHS)
+        and importlib.util.find_spec("PIL") is not None
+    )
+
+
+def start():
+    global _executor
+    with _lock:
+        if _executor is not None:
+            return
+        if not is_enabled():
+            logger.info("이미지 축소본 생성 비활성화 (IMAGE_WORKER_PROCESSES=0 또는 Pillow 미설치)")
+            return
+        _executor = ProcessPoolExecutor(
+            max_workers=IMAGE_WORKER_PROCESSES,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+
+def stop():
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def derivative_url(image_url: str, width: int) -> str:
+    stem, _ = os.path.splitext(image_url)
+    return f"{stem}_w{width}.webp"
+
+
+# 게시글 이미지 축소본 생성 요청 (image_url은 "/uploads/..." 형태)
+def submit(post_id: int, image_url: str) -> bool:
+    start()
+    if _executor is None:
+        return False
+
+    source_path = image_url.lstrip("/")
+    targets = [(width, derivative_url(image_url, width).lstrip("/")) for width in IMAGE_DERIVATIVE_WIDTHS]
+    try:
+        future = _executor.submit(_make_derivatives, source_path, targets, IMAGE_WEBP_QUALITY)
+    except RuntimeError:
+        # 종료 중
+        return False
+    future.add_done_callback(lambda f: _on_done(f, post_id, image_url))
+    return True
+
+
+def _on_done(future: Future, post_id: int, image_url: str):
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is not None:
+        logger.warning("이미지 축소본 생성 실패 post_id=%s: %s", post_id, error)
+        return
+
+    db = SessionLocal()
+    try:
+        # 그 사이 이미지가 바뀌었으면 저장하지 않는다
+        db.query(PostORM).filter(PostORM.id == post_id, PostORM.image == image_url).update(
+            {PostORM.image_thumb: derivative_url(image_url, IMAGE_DERIVATIVE_WIDTHS[0])},
+            synchronize_session=False,
+        )
+        db.commit()
+        response_cache.invalidate(response_cache.FEED)
+    except Exception:
+        db.rollback()
+        logger.exception("이미지 썸네일 저장 실패 post_id=%s", post_id)
+    finally:
+        db.close()
+
+
+# -------------------------------
+# 워커 프로세스에서 실행
+# -------------------------------
+def _make_derivatives(source_path: str, targets: list[tuple[int, str]], quality: int):
+    from PIL import Image, ImageOps
+
+    with Image.open(source_path) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+        for width, target_path in targets:
+            # 같은 내용의 이미지는 축소본도 같으므로 이미 있으면 건너뜀
+            if os.path.exists(target_path):
+                continue
+            resized = image.copy()
+            # 원본보다 크게 늘리지는 않는다
+            resized.thumbnail((width, width * 4), Image.LANCZOS)
+
+            # 같은 이미지를 여러 워커가 동시에 만들 수 있으므로 임시 파일 이름은 겹치지 않게
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target_path), prefix=TMP_PREFIX, suffix=".part")
+            try:
+                with os.fdopen(fd, "wb") as tmp_file:
+                    resized.save(tmp_file, "WEBP", quality=quality, method=4)
+                os.replace(tmp_path, target_path)
+            except BaseException:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
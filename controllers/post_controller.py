@@ -1,21 +1,55 @@
 from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, insert, update
 from sqlalchemy.orm import Session
+from typing import TYPE_CHECKING
 from datetime import datetime
-from typing import Set
-import os
-
-from models.post_model import PostORM, Post, PostCreate, PostUpdate
-from models.comment_model import CommentCreate
-from controllers.ai_controller import generate_comment
-from models.ai_model import CommentGenRequest
-from controllers.comment_controller import add_comment
-
-from sqlalchemy.exc import IntegrityError
-from models.comment_model import CommentORM
-
-
-UPLOAD_DIR = "uploads"
-liked_posts: Set[int] = set()
+import time
+
+from models.post_model import (
+    PostORM, Post, PostSummary, PostCreate, PostUpdate, EXCERPT_MAX_LENGTH,
+)
+from controllers import ai_comment_worker, image_derivatives, response_cache, search_index, upload_storage
+from controllers.cursor import decode_id_cursor, encode_id_cursor
+from controllers.upload_storage import StoredUpload, save_upload
+from controllers.view_counter import view_counter
+
+from sqlalchemy.exc import OperationalError
+from models.comment_model import CommentORM, Comment
+from models.like_model import PostLikeORM
+
+if TYPE_CHECKING:  # 비동기 모드에서만 실제로 import (greenlet 필요)
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+# 피드 페이지네이션
+FEED_DEFAULT_LIMIT = 20
+FEED_MAX_LIMIT = 100
+POST_COUNT_TTL_SECONDS = 60
+
+# 검색 페이지네이션 (순위 기반이라 offset, 너무 깊은 페이지는 막는다)
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 50
+SEARCH_MAX_OFFSET = 1000
+SEARCH_QUERY_MAX_LENGTH = 100
+
+# 목록 조회 시 SELECT 할 컬럼 (content 제외)
+_FEED_COLUMNS = (
+    PostORM.id,
+    PostORM.title,
+    PostORM.excerpt,
+    PostORM.author,
+    PostORM.image,
+    PostORM.image_thumb,
+    PostORM.views,
+    PostORM.likes,
+    PostORM.comment_count,
+    PostORM.created_at,
+    PostORM.updated_at,
+)
+
+# 전체 게시글 수 캐시 (페이지 요청마다 COUNT(*) 하지 않도록)
+_post_count_cache = {"value": None, "expires_at": 0.0}
 
 
 def _format_number(n: int) -> str:
@@ -28,6 +62,16 @@ def _format_number(n: int) -> str:
     return str(n)
 
 
+# 쓰기 함수는 (응답, 무효화할 캐시 네임스페이스, 삭제할 이미지)를 돌려주고
+# 커밋 후 처리는 호출 측에서 한다 (비동기 버전은 이벤트 루프 밖에서 실행)
+def _after_commit(outcome: tuple[dict, list[str], list[str]]) -> dict:
+    result, namespaces, unused_files = outcome
+    response_cache.invalidate(*namespaces)
+    # 더 이상 참조되지 않는 이미지는 커밋 후 삭제
+    upload_storage.remove_files(unused_files)
+    return result
+
+
 def _get_post(db: Session, post_id: int) -> PostORM:
     post = db.query(PostORM).filter(PostORM.id == post_id).first()
     if not post:
@@ -35,50 +79,146 @@ def _get_post(db: Session, post_id: int) -> PostORM:
     return post
 
 
+# 현재 유저가 좋아요한 게시글 id (페이지 단위로 한 번에 조회)
+def _liked_post_ids(db: Session, user, post_ids: list[int]) -> set[int]:
+    if user is None or not post_ids:
+        return set()
+
+    rows = (
+        db.query(PostLikeORM.post_id)
+        .filter(PostLikeORM.user_id == user.id, PostLikeORM.post_id.in_(post_ids))
+        .all()
+    )
+    return {row.post_id for row in rows}
+
+
+def _make_excerpt(content: str) -> str:
+    text = " ".join(content.split())
+    if len(text) <= EXCERPT_MAX_LENGTH:
+        return text
+    return text[: EXCERPT_MAX_LENGTH - 1] + "…"
+
+
+def _get_cached_post_count(db: Session) -> int:
+    now = time.monotonic()
+    if _post_count_cache["value"] is None or now >= _post_count_cache["expires_at"]:
+        _post_count_cache["value"] = db.query(func.count(PostORM.id)).scalar()
+        _post_count_cache["expires_at"] = now + POST_COUNT_TTL_SECONDS
+    return _post_count_cache["value"]
+
+
 # -------------------------------
-# 게시글 목록
+# 게시글 목록 (id 기준 커서 페이지네이션)
 # -------------------------------
-def get_all_posts(db: Session):
-    posts = db.query(PostORM).order_by(PostORM.id.desc()).all()
+def get_all_posts(
+    db: Session,
+    limit: int = FEED_DEFAULT_LIMIT,
+    cursor: str | None = None,
+    include_count: bool = False,
+    user=None,
+):
+    limit = max(1, min(limit, FEED_MAX_LIMIT))
+
+    query = db.query(*_FEED_COLUMNS)
+    if cursor:
+        query = query.filter(PostORM.id < decode_id_cursor(cursor))
+
+    # 다음 페이지 존재 여부 확인용으로 1개 더 조회
+    posts = query.order_by(PostORM.id.desc()).limit(limit + 1).all()
+    has_next = len(posts) > limit
+    posts = posts[:limit]
+
+    return {
+        "count": _get_cached_post_count(db) if include_count else None,
+        "posts": _format_summaries(db, posts, user),
+        "next_cursor": encode_id_cursor(posts[-1].id) if has_next else None,
+    }
+
+
+# 목록/검색 결과 공통 포맷
+def _format_summaries(db: Session, posts, user) -> list[dict]:
+    # 아직 DB에 반영되지 않은 조회수 합산
+    pending_views = view_counter.pending_many(p.id for p in posts)
+    liked_ids = _liked_post_ids(db, user, [p.id for p in posts])
 
     formatted_posts = []
     for p in posts:
-        post_schema = Post.from_orm(p).dict()
+        post_schema = PostSummary.from_orm(p).dict()
+        post_schema["views"] += pending_views[p.id]
         formatted_posts.append(
             {
                 **post_schema,
-                "views_display": _format_number(p.views),
+                "views_display": _format_number(post_schema["views"]),
                 "likes_display": _format_number(p.likes),
-                "is_liked": p.id in liked_posts,
+                "is_liked": p.id in liked_ids,
             }
         )
-    return {"count": len(formatted_posts), "posts": formatted_posts}
+    return formatted_posts
+
+
+# -------------------------------
+# 게시글 검색 (제목/본문/댓글, 관련도 순)
+# -------------------------------
+def search_posts(
+    db: Session,
+    q: str,
+    limit: int = SEARCH_DEFAULT_LIMIT,
+    cursor: str | None = None,
+    user=None,
+):
+    q = q.strip()
+    if not q:
+        raise HTTPException(400, "검색어를 입력해주세요.")
+    if len(q) > SEARCH_QUERY_MAX_LENGTH:
+        raise HTTPException(400, f"검색어는 최대 {SEARCH_QUERY_MAX_LENGTH}자까지 입력할 수 있습니다.")
+
+    limit = max(1, min(limit, SEARCH_MAX_LIMIT))
+    offset = decode_id_cursor(cursor, "offset") if cursor else 0
+    if offset > SEARCH_MAX_OFFSET:
+        raise HTTPException(400, "더 이상 검색 결과를 불러올 수 없습니다. 검색어를 좁혀주세요.")
+
+    ranked = search_index.search(db, q, limit + 1, offset)
+    has_next = len(ranked) > limit
+    ranked = ranked[:limit]
+
+    # 순위 순서대로 게시글 요약 조회 (페이지당 1번)
+    ids = [post_id for post_id, _ in ranked]
+    rows = {p.id: p for p in db.query(*_FEED_COLUMNS).filter(PostORM.id.in_(ids)).all()} if ids else {}
+    posts = [rows[post_id] for post_id in ids if post_id in rows]
+
+    next_offset = offset + limit
+    return {
+        "query": q,
+        "posts": _format_summaries(db, posts, user),
+        "next_cursor": (
+            encode_id_cursor(next_offset, "offset") if has_next and next_offset <= SEARCH_MAX_OFFSET else None
+        ),
+    }
 
 
 # -------------------------------
 # 게시글 상세
 # -------------------------------
-def get_post_detail(db: Session, post_id: int):
+def get_post_detail(db: Session, post_id: int, user=None):
     post = _get_post(db, post_id)
 
-    # 조회수 증가
-    post.views += 1
-    db.commit()
-    db.refresh(post)
+    # 조회수 증가 (메모리에 누적 후 주기적으로 DB 반영)
+    view_counter.increment(post_id)
 
     post_schema = Post.from_orm(post).dict()
+    post_schema["views"] += view_counter.pending(post_id)
     return {
         **post_schema,
-        "views_display": _format_number(post.views),
+        "views_display": _format_number(post_schema["views"]),
         "likes_display": _format_number(post.likes),
-        "is_liked": post_id in liked_posts,
+        "is_liked": post_id in _liked_post_ids(db, user, [post_id]),
     }
 
 
 # -------------------------------
-# 게시글 생성 (+AI 자동 댓글)
+# 게시글 생성 (+AI 자동 댓글은 백그라운드 작업으로)
 # -------------------------------
-def create_post(db: Session, data: PostCreate, file: UploadFile | None = None):
+def _validate_new_post(data: PostCreate) -> tuple[str, str]:
     title = data.title.strip()
     content = data.content.strip()
 
@@ -87,53 +227,91 @@ def create_post(db: Session, data: PostCreate, file: UploadFile | None = None):
     if len(title) > 26:
         raise HTTPException(400, "제목은 최대 26자까지만 작성 가능합니다.")
 
-    # 이미지 저장
-    image_url = None
-    if file:
-        os.makedirs(UPLOAD_DIR, exist_ok=True)
-        filename = f"post_{int(datetime.now().timestamp())}_{file.filename}"
-        file_path = os.path.join(UPLOAD_DIR, filename)
-        with open(file_path, "wb") as f:
-            f.write(file.file.read())
-        image_url = f"/{file_path}"
-
-    # DB 저장
+    return title, content
+
+
+# 게시글 행 추가 (커밋 전, 이미지 참조 수도 같은 트랜잭션에서 증가)
+def _stage_post(db: Session, title: str, content: str, author: str | None, upload: StoredUpload | None) -> PostORM:
+    if upload:
+        upload_storage.acquire(db, upload)
     new_post = PostORM(
         title=title,
         content=content,
-        author=data.author or "익명",
-        image=image_url,
+        excerpt=_make_excerpt(content),
+        author=author or "익명",
+        image=upload.url if upload else None,
         views=0,
         likes=0,
+        comment_count=0,
         created_at=datetime.now(),
         updated_at=None,
+        ai_comment_status=ai_comment_worker.STATUS_PENDING,
     )
     db.add(new_post)
+    db.flush()
+    search_index.index_post(db, new_post)
+    return new_post
+
+
+def _finish_post(db: Session, new_post: PostORM):
     db.commit()
     db.refresh(new_post)
 
-    # AI 댓글 생성
-    ai_request = CommentGenRequest(
-        post_title=new_post.title,
-        post_content=new_post.content,
-    )
+    # 썸네일은 백그라운드 프로세스에서 생성
+    if new_post.image:
+        image_derivatives.submit(new_post.id, new_post.image)
 
-    ai_comment_text = generate_comment(ai_request)["comment"]
+    # AI 댓글은 워커가 생성 후 저장 (응답은 바로 반환)
+    # 큐가 가득 차면 pending으로 남겨 두고 워커의 주기적 재등록에서 처리
+    ai_comment_worker.enqueue(new_post.id, new_post.title, new_post.content)
 
-    ai_comment = CommentCreate(author="AI Bot", content=ai_comment_text)
-    add_comment(db, new_post.id, ai_comment)
-
-    return {
+    result = {
         "message": "게시글이 등록되었습니다.",
         "post": Post.from_orm(new_post),
-        "ai_comment": ai_comment_text,
+        "ai_comment_status": new_post.ai_comment_status,
     }
+    return result, [response_cache.FEED], []
+
+
+def create_post(db: Session, data: PostCreate, file: UploadFile | None = None):
+    title, content = _validate_new_post(data)
+
+    # 이미지 저장 (같은 내용이면 기존 파일 재사용)
+    upload = save_upload(file) if file else None
+
+    new_post = _stage_post(db, title, content, data.author, upload)
+    # 참조 행을 잠근 상태(커밋 전)에서 파일 배치
+    upload_storage.place(upload)
+    return _after_commit(_finish_post(db, new_post))
+
+
+# -------------------------------
+# AI 자동 댓글 상태 조회
+# -------------------------------
+def get_ai_comment_status(db: Session, post_id: int):
+    post = _get_post(db, post_id)
+
+    comment = None
+    if post.ai_comment_status == ai_comment_worker.STATUS_DONE:
+        ai_comment = (
+            db.query(CommentORM)
+            .filter(
+                CommentORM.post_id == post_id,
+                CommentORM.author == ai_comment_worker.AI_COMMENT_AUTHOR,
+            )
+            .order_by(CommentORM.id.asc())
+            .first()
+        )
+        if ai_comment:
+            comment = Comment.from_orm(ai_comment)
+
+    return {"post_id": post_id, "status": post.ai_comment_status, "comment": comment}
 
 
 # -------------------------------
 # 게시글 수정 (작성자 본인만 가능)
 # -------------------------------
-def update_post(db: Session, post_id: int, data: PostUpdate, file: UploadFile | None, user):
+def _validate_update(db: Session, post_id: int, data: PostUpdate, user):
     post = _get_post(db, post_id)
 
     # 🔥 작성자 체크 추가
@@ -146,29 +324,65 @@ def update_post(db: Session, post_id: int, data: PostUpdate, file: UploadFile |
     if len(new_title) > 26:
         raise HTTPException(400, "제목은 최대 26자까지만 작성 가능합니다.")
 
+    return post, new_title, new_content
+
+
+# 수정 내용 반영 (커밋 전), 이미지가 바뀌었는지와 더 이상 참조되지 않는 파일 목록 반환
+def _stage_update(
+    db: Session, post: PostORM, new_title: str, new_content: str, upload: StoredUpload | None
+) -> tuple[bool, list[str]]:
     post.title = new_title
     post.content = new_content
+    post.excerpt = _make_excerpt(new_content)
     post.updated_at = datetime.now()
 
-    # 파일 업로드 처리
-    if file:
-        os.makedirs(UPLOAD_DIR, exist_ok=True)
-        filename = f"post_{post_id}_{file.filename}"
-        file_path = os.path.join(UPLOAD_DIR, filename)
-        with open(file_path, "wb") as f:
-            f.write(file.file.read())
-        post.image = f"/{file_path}"
+    # 이미지 교체 시 새 이미지 참조 +1, 기존 이미지 참조 -1 (다른 게시글이 쓰고 있으면 파일 유지)
+    unused_files = []
+    image_changed = upload is not None and upload.url != post.image
+    if image_changed:
+        upload_storage.acquire(db, upload)
+        unused_files = upload_storage.release(db, post.image)
+        post.image = upload.url
+        post.image_thumb = None
+
+    search_index.index_post(db, post)
+    return image_changed, unused_files
+
+
+# 새 이미지는 참조 행을 잠근 상태(커밋 전)에서 배치, 쓰지 않는 업로드는 임시 파일만 삭제 (블로킹 I/O)
+def _store_upload(upload: StoredUpload | None, image_changed: bool):
+    if image_changed:
+        upload_storage.place(upload)
+    else:
+        upload_storage.discard(upload)
+
 
+def _finish_update(db: Session, post: PostORM, image_changed: bool, unused_files: list[str]):
     db.commit()
     db.refresh(post)
 
-    return {"message": "게시글이 수정되었습니다.", "post": Post.from_orm(post)}
+    if image_changed:
+        image_derivatives.submit(post.id, post.image)
+
+    result = {"message": "게시글이 수정되었습니다.", "post": Post.from_orm(post)}
+    return result, [response_cache.FEED], unused_files
+
+
+def update_post(db: Session, post_id: int, data: PostUpdate, file: UploadFile | None, user):
+    post, new_title, new_content = _validate_update(db, post_id, data, user)
+
+    # 파일 업로드 처리
+    upload = save_upload(file) if file else None
+
+    image_changed, unused_files = _stage_update(db, post, new_title, new_content, upload)
+    _store_upload(upload, image_changed)
+    return _after_commit(_finish_update(db, post, image_changed, unused_files))
 
 
 # -------------------------------
 # 게시글 삭제 (작성자 본인만 가능)
 # -------------------------------
-def delete_post(db: Session, post_id: int, user):
+def _delete_post(db: Session, post_id: int, user):
     post = _get_post(db, post_id)
 
     # 🔥 작성자 체크 추가
@@ -176,39 +390,168 @@ def delete_post(db: Session, post_id: int, user):
         raise HTTPException(403, "본인이 작성한 게시글만 삭제할 수 있습니다.")
 
     try:
-        # 댓글 삭제 후 게시글 삭제
+        # 검색 문서, 댓글, 좋아요 삭제 후 게시글 삭제 (comment_count는 게시글과 함께 사라짐)
+        search_index.remove_post(db, post_id)
         db.query(CommentORM).filter(CommentORM.post_id == post_id).delete()
+        db.query(PostLikeORM).filter(PostLikeORM.post_id == post_id).delete()
+        unused_files = upload_storage.release(db, post.image)
         db.delete(post)
         db.commit()
-        return {"message": "게시글이 삭제되었습니다."}
-
     except Exception:
         db.rollback()
         raise HTTPException(500, "게시글 삭제 중 오류가 발생했습니다.")
 
+    namespaces = [response_cache.FEED, response_cache.comments_namespace(post_id)]
+    return {"message": "게시글이 삭제되었습니다."}, namespaces, unused_files
+
+
+def delete_post(db: Session, post_id: int, user):
+    return _after_commit(_delete_post(db, post_id, user))
+
 
 # -------------------------------
-# 좋아요 토글
+# 좋아요 토글 (유저별, 카운터는 원자적 UPDATE)
 # -------------------------------
-def toggle_like(db: Session, post_id: int):
-    post = _get_post(db, post_id)
+# MySQL(REPEATABLE READ)에서 없는 행에 대한 동시 토글은 갭 락으로 데드락(1213)이 날 수 있어 재시도
+LIKE_DEADLOCK_RETRIES = 3
+_MYSQL_DEADLOCK = 1213
+
 
-    if post_id in liked_posts:
-        liked_posts.remove(post_id)
-        post.likes = max(0, post.likes - 1)
-        message = "좋아요 취소됨"
-        is_liked = False
+def _is_deadlock(error: OperationalError) -> bool:
+    args = getattr(error.orig, "args", ())
+    return bool(args) and args[0] == _MYSQL_DEADLOCK
+
+
+# 이미 있으면 무시하는 INSERT (동시 요청이 먼저 추가한 경우 rowcount 0)
+def _insert_like(db: Session, user_id: int, post_id: int) -> int:
+    stmt = insert(PostLikeORM).values(user_id=user_id, post_id=post_id)
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        stmt = stmt.prefix_with("OR IGNORE")
+    elif dialect == "mysql":
+        stmt = stmt.prefix_with("IGNORE")
+    return db.execute(stmt).rowcount
+
+
+def _toggle_like_row(db: Session, post_id: int, user_id: int) -> bool:
+    # 이미 좋아요한 상태면 삭제되고, 아니면 0건
+    deleted = (
+        db.query(PostLikeORM)
+        .filter(PostLikeORM.user_id == user_id, PostLikeORM.post_id == post_id)
+        .delete(synchronize_session=False)
+    )
+
+    if deleted:
+        db.execute(
+            update(PostORM)
+            .where(PostORM.id == post_id, PostORM.likes > 0)
+            .values(likes=PostORM.likes - 1)
+        )
+        return False
+
+    if _insert_like(db, user_id, post_id):
+        db.execute(
+            update(PostORM)
+            .where(PostORM.id == post_id)
+            .values(likes=PostORM.likes + 1)
+        )
+    return True
+
+
+def _toggle_like(db: Session, post_id: int, user):
+    if not db.query(PostORM.id).filter(PostORM.id == post_id).first():
+        raise HTTPException(404, "게시글을 찾을 수 없습니다.")
+
+    for _ in range(LIKE_DEADLOCK_RETRIES):
+        try:
+            is_liked = _toggle_like_row(db, post_id, user.id)
+            db.commit()
+            break
+        except OperationalError as e:
+            db.rollback()
+            if not _is_deadlock(e):
+                raise
     else:
-        liked_posts.add(post_id)
-        post.likes += 1
-        message = "좋아요 추가됨"
-        is_liked = True
+        raise HTTPException(409, "요청이 몰려 처리하지 못했습니다. 잠시 후 다시 시도해주세요.")
 
-    db.commit()
-    db.refresh(post)
+    likes = db.query(PostORM.likes).filter(PostORM.id == post_id).scalar()
 
-    return {
-        "message": message,
-        "likes": post.likes,
+    result = {
+        "message": "좋아요 추가됨" if is_liked else "좋아요 취소됨",
+        "likes": likes,
         "is_liked": is_liked,
     }
+    return result, [response_cache.FEED], []
+
+
+def toggle_like(db: Session, post_id: int, user):
+    return _after_commit(_toggle_like(db, post_id, user))
+
+
+# -------------------------------
+# 비동기 버전 (DB_ASYNC=1, AsyncSession)
+# -------------------------------
+# ORM 로직은 위 함수를 run_sync로 그대로 재사용하고 (I/O는 비동기 드라이버가 처리),
+# 파일 저장처럼 블로킹되는 작업만 스레드풀로 넘긴다.
+async def _after_commit_async(outcome: tuple[dict, list[str], list[str]]) -> dict:
+    result, namespaces, unused_files = outcome
+    await response_cache.invalidate_async(*namespaces)
+    if unused_files:
+        await run_in_threadpool(upload_storage.remove_files, unused_files)
+    return result
+
+
+async def get_all_posts_async(
+    db: "AsyncSession",
+    limit: int = FEED_DEFAULT_LIMIT,
+    cursor: str | None = None,
+    include_count: bool = False,
+    user=None,
+):
+    return await db.run_sync(get_all_posts, limit, cursor, include_count, user)
+
+
+async def search_posts_async(
+    db: "AsyncSession",
+    q: str,
+    limit: int = SEARCH_DEFAULT_LIMIT,
+    cursor: str | None = None,
+    user=None,
+):
+    return await db.run_sync(search_posts, q, limit, cursor, user)
+
+
+async def get_post_detail_async(db: "AsyncSession", post_id: int, user=None):
+    return await db.run_sync(get_post_detail, post_id, user)
+
+
+async def get_ai_comment_status_async(db: "AsyncSession", post_id: int):
+    return await db.run_sync(get_ai_comment_status, post_id)
+
+
+async def create_post_async(db: "AsyncSession", data: PostCreate, file: UploadFile | None = None):
+    title, content = _validate_new_post(data)
+
+    upload = await run_in_threadpool(save_upload, file) if file else None
+
+    new_post = await db.run_sync(_stage_post, title, content, data.author, upload)
+    await run_in_threadpool(upload_storage.place, upload)
+    return await _after_commit_async(await db.run_sync(_finish_post, new_post))
+
+
+async def update_post_async(db: "AsyncSession", post_id: int, data: PostUpdate, file: UploadFile | None, user):
+    post, new_title, new_content = await db.run_sync(_validate_update, post_id, data, user)
+
+    upload = await run_in_threadpool(save_upload, file) if file else None
+
+    image_changed, unused_files = await db.run_sync(_stage_update, post, new_title, new_content, upload)
+    await run_in_threadpool(_store_upload, upload, image_changed)
+    return await _after_commit_async(await db.run_sync(_finish_update, post, image_changed, unused_files))
+
+
+async def delete_post_async(db: "AsyncSession", post_id: int, user):
+    return await _after_commit_async(await db.run_sync(_delete_post, post_id, user))
+
+
+async def toggle_like_async(db: "AsyncSession", post_id: int, user):
+    return await _after_commit_async(await db.run_sync(_toggle_like, post_id, user))
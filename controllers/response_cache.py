@@ -0,0 +1,257 @@
+# controllers/response_cache.py
+# 목록/댓글 조회 응답 캐시 (버전 기반 무효화 + ETag/304)
+# 캐시 키에 네임스페이스 버전("feed", "comments:<post_id>")을 넣고,
+# 쓰기 경로에서 커밋 후 invalidate()로 버전을 올리면 이전 응답은 더 이상 조회되지 않는다.
+#
+# 백엔드
+# - 기본: 프로세스 메모리 LRU (워커마다 따로)
+# - RESPONSE_CACHE_REDIS_URL 지정 시: redis (워커끼리 버전/응답 공유, `pip install redis` 필요)
+# 조회수는 무효화 대상이 아니므로 최대 RESPONSE_CACHE_TTL초 늦게 반영된다.
+#
+# 복제본 사용 시
+# - 쓰기 직후(read_primary 쿠키) 요청은 캐시를 조회/저장하지 않고 primary에서 읽는다
+# - 복제본에서 읽은 응답은 키를 따로 두어, 쓰기 후 버전에 저장된 지연 데이터가 primary 응답으로 쓰이지 않게 한다
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+
+from database import READ_PRIMARY_COOKIE
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "30"))  # 0이면 끔
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))
+RESPONSE_CACHE_REDIS_URL = os.getenv("RESPONSE_CACHE_REDIS_URL")
+
+FEED = "feed"
+
+
+def comments_namespace(post_id: int) -> str:
+    return f"comments:{post_id}"
+
+
+class MemoryBackend:
+    blocking = False
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        # key -> (만료 시각, etag, body)
+        self._items: OrderedDict[str, tuple[float, str, bytes]] = OrderedDict()
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> tuple[str, bytes] | None:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None or item[0] <= time.monotonic():
+                self._items.pop(key, None)
+                return None
+            self._items.move_to_end(key)
+            return item[1], item[2]
+
+    def set(self, key: str, etag: str, body: bytes, ttl: float):
+        with self._lock:
+            self._items[key] = (time.monotonic() + ttl, etag, body)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def versions(self, namespaces: list[str]) -> list[int]:
+        with self._lock:
+            return [self._versions.get(ns, 0) for ns in namespaces]
+
+    def bump(self, namespaces: list[str]):
+        with self._lock:
+            for ns in namespaces:
+                self._versions[ns] = self._versions.get(ns, 0) + 1
+
+    def size(self) -> int:
+        return len(self._items)
+
+
+class RedisBackend:
+    blocking = True
+
+    def __init__(self, url: str):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> tuple[str, bytes] | None:
+        value = self._redis.get(f"resp:{key}")
+        if value is None:
+            return None
+        etag, _, body = value.partition(b"\n")
+        return etag.decode(), body
+
+    def set(self, key: str, etag: str, body: bytes, ttl: float):
+        self._redis.set(f"resp:{key}", etag.encode() + b"\n" + body, px=int(ttl * 1000))
+
+    def versions(self, namespaces: list[str]) -> list[int]:
+        values = self._redis.mget([f"resp-ver:{ns}" for ns in namespaces])
+        return [int(v) if v is not None else 0 for v in values]
+
+    def bump(self, namespaces: list[str]):
+        pipe = self._redis.pipeline()
+        for ns in namespaces:
+            pipe.incr(f"resp-ver:{ns}")
+        pipe.execute()
+
+    def size(self) -> int | None:
+        return None
+
+
+def _create_backend():
+    if RESPONSE_CACHE_REDIS_URL:
+        try:
+            return RedisBackend(RESPONSE_CACHE_REDIS_URL)
+        except ImportError:
+            logger.warning("redis 패키지가 없어 응답 캐시를 프로세스 메모리에 저장합니다.")
+    return MemoryBackend(RESPONSE_CACHE_SIZE)
+
+
+_backend = _create_backend()
+_stats = {"hits": 0, "misses": 0, "not_modified": 0, "errors": 0}
+
+
+def is_enabled() -> bool:
+    return RESPONSE_CACHE_TTL > 0
+
+
+def _bypass(request: Request) -> bool:
+    return not is_enabled() or bool(request.cookies.get(READ_PRIMARY_COOKIE))
+
+
+# 쓰기 경로에서 커밋 후 호출
+def invalidate(*namespaces: str):
+    if not is_enabled() or not namespaces:
+        return
+    try:
+        _backend.bump(list(namespaces))
+    except Exception:
+        # 공유 백엔드 장애 시에도 쓰기 요청은 성공시킨다 (TTL 후 갱신)
+        _stats["errors"] += 1
+        logger.exception("응답 캐시 무효화 실패: %s", namespaces)
+
+
+# 비동기 쓰기 경로용 (redis 같은 블로킹 백엔드는 이벤트 루프를 막지 않도록 스레드풀에서)
+async def invalidate_async(*namespaces: str):
+    if _backend.blocking:
+        await run_in_threadpool(invalidate, *namespaces)
+    else:
+        invalidate(*namespaces)
+
+
+def _cache_key(request: Request, namespaces: list[str], versions: list[int], user) -> str:
+    query = urlencode(sorted(request.query_params.multi_items()))
+    version_tag = ",".join(f"{ns}={v}" for ns, v in zip(namespaces, versions))
+    # is_liked 등 유저별 필드가 있으므로 로그인 유저는 따로 저장
+    owner = f"u{user.id}" if user is not None else "anon"
+    # get_read_db가 기록한 읽기 DB (primary / replica)
+    source = getattr(request.state, "read_source", "primary")
+    return f"{request.url.path}?{query}|{owner}|{source}|{version_tag}"
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return any(tag.strip().removeprefix("W/") in (etag, "*") for tag in header.split(","))
+
+
+def _respond(request: Request, etag: str, body: bytes, status: str) -> Response:
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", "X-Cache": status}
+    if _etag_matches(request, etag):
+        _stats["not_modified"] += 1
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def _encode(payload) -> tuple[str, bytes]:
+    body = json.dumps(jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"', body
+
+
+def _lookup(request: Request, namespaces: list[str], user) -> tuple[str | None, tuple[str, bytes] | None]:
+    try:
+        key = _cache_key(request, namespaces, _backend.versions(namespaces), user)
+        return key, _backend.get(key)
+    except Exception:
+        _stats["errors"] += 1
+        logger.exception("응답 캐시 조회 실패")
+        return None, None
+
+
+def _store(key: str | None, etag: str, body: bytes):
+    if key is None:
+        return
+    try:
+        _backend.set(key, etag, body, RESPONSE_CACHE_TTL)
+    except Exception:
+        _stats["errors"] += 1
+        logger.exception("응답 캐시 저장 실패")
+
+
+# -------------------------------
+# 라우터에서 사용
+# -------------------------------
+# 캐시에 있으면 그대로(또는 304), 없으면 build()로 만든 결과를 저장 후 반환
+def cached(request: Request, namespaces: list[str], build: Callable[[], object], user=None) -> Response:
+    if _bypass(request):
+        return _respond(request, *_encode(build()), "BYPASS")
+
+    key, hit = _lookup(request, namespaces, user)
+    if hit is not None:
+        _stats["hits"] += 1
+        return _respond(request, *hit, "HIT")
+
+    _stats["misses"] += 1
+    etag, body = _encode(build())
+    _store(key, etag, body)
+    return _respond(request, etag, body, "MISS")
+
+
+async def cached_async(
+    request: Request, namespaces: list[str], build: Callable[[], Awaitable[object]], user=None
+) -> Response:
+    if _bypass(request):
+        return _respond(request, *_encode(await build()), "BYPASS")
+
+    # redis 같은 공유 백엔드는 블로킹 클라이언트라 스레드풀에서 호출
+    if _backend.blocking:
+        key, hit = await run_in_threadpool(_lookup, request, namespaces, user)
+    else:
+        key, hit = _lookup(request, namespaces, user)
+    if hit is not None:
+        _stats["hits"] += 1
+        return _respond(request, *hit, "HIT")
+
+    _stats["misses"] += 1
+    etag, body = _encode(await build())
+    if _backend.blocking:
+        await run_in_threadpool(_store, key, etag, body)
+    else:
+        _store(key, etag, body)
+    return _respond(request, etag, body, "MISS")
+
+
+def get_stats() -> dict:
+    total = _stats["hits"] + _stats["misses"]
+    return {
+        "enabled": is_enabled(),
+        "backend": type(_backend).__name__,
+        "size": _backend.size(),
+        "ttl_seconds": RESPONSE_CACHE_TTL,
+        **_stats,
+        "hit_rate": round(_stats["hits"] / total, 4) if total else 0.0,
+    }
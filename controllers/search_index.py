@@ -0,0 +1,265 @@
+# controllers/search_index.py
+# 게시글/댓글 전문 검색 인덱스 (search_docs)
+# 문서 1개 = 게시글 1개(제목+본문) 또는 댓글 1개. 게시글/댓글 쓰기와 같은 트랜잭션에서 갱신한다.
+# doc_id는 게시글이면 post_id, 댓글이면 -comment_id
+#
+# 한국어는 띄어쓰기 단위 단어로는 검색이 잘 안 되므로(조사, 복합어) 글자 2-gram으로 색인한다.
+# - SQLite: FTS5 가상 테이블에 2-gram 토큰을 공백으로 이어 저장, bm25로 순위
+# - MySQL: 원문을 저장하고 FULLTEXT ... WITH PARSER ngram (ngram_token_size=2)로 순위
+# 테이블이 아직 없으면(스키마 미적용) 색인/검색을 건너뛴다.
+import logging
+import os
+import re
+import time
+import unicodedata
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = "search_docs"
+# 제목 일치를 본문/댓글보다 높게
+TITLE_WEIGHT = 5.0
+# 순위를 매길 후보 문서 수 상한 (아주 흔한 검색어도 비용이 데이터 크기와 무관하게)
+SEARCH_CANDIDATE_LIMIT = int(os.getenv("SEARCH_CANDIDATE_LIMIT", "2000"))
+# 테이블이 없을 때 다시 확인하는 간격(초), 배포 중 스키마를 적용하면 재시작 없이 색인을 시작한다
+SEARCH_TABLE_RECHECK_SECONDS = float(os.getenv("SEARCH_TABLE_RECHECK_SECONDS", "30"))
+
+_WORD = re.compile(r"\w+")
+# 테이블이 확인된 엔진 (있다는 결과만 계속 기억)
+_available: set[int] = set()
+# 엔진별 테이블이 없다고 마지막으로 확인한 시각
+_missing_checked_at: dict[int, float] = {}
+
+
+# -------------------------------
+# 토큰화
+# -------------------------------
+def _words(value: str) -> list[str]:
+    return _WORD.findall(unicodedata.normalize("NFKC", value).lower())
+
+
+def _bigrams(word: str) -> list[str]:
+    if len(word) < 2:
+        return [word]
+    return [word[i : i + 2] for i in range(len(word) - 1)]
+
+
+def ngram_text(value: str) -> str:
+    return " ".join(gram for word in _words(value) for gram in _bigrams(word))
+
+
+def _fts5_query(query: str) -> str | None:
+    # 단어마다 2-gram이 연달아 나오는 구문("검색 색어")으로 찾고, 단어끼리는 AND
+    # 한 글자 단어는 그 글자로 시작하는 2-gram 접두어 검색
+    phrases = []
+    for word in dict.fromkeys(_words(query)):
+        if len(word) < 2:
+            phrases.append(f'"{word}" *')
+        else:
+            phrases.append('"' + " ".join(_bigrams(word)) + '"')
+    return " ".join(phrases) or None
+
+
+def _mysql_query(query: str) -> str | None:
+    # BOOLEAN MODE에서 ngram 파서는 단어를 2-gram 구문으로 바꿔 찾는다
+    words = _words(query)
+    if not words:
+        return None
+    return " ".join(f'+"{word}"' for word in words)
+
+
+# -------------------------------
+# 스키마
+# -------------------------------
+def create_table(conn: Connection):
+    if conn.dialect.name == "sqlite":
+        conn.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} "
+            "USING fts5(title, body, post_id UNINDEXED, tokenize='unicode61')"
+        ))
+    else:
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+            " doc_id BIGINT NOT NULL PRIMARY KEY,"
+            " post_id INT NOT NULL,"
+            " title VARCHAR(255) NOT NULL DEFAULT '',"
+            " body MEDIUMTEXT NOT NULL,"
+            " KEY ix_search_docs_post_id (post_id),"
+            " FULLTEXT KEY ft_search_docs (title, body) WITH PARSER ngram"
+            ") DEFAULT CHARSET=utf8mb4"
+        ))
+    _missing_checked_at.clear()
+
+
+def is_available(db: Session) -> bool:
+    bind = db.get_bind()
+    engine = bind.engine if isinstance(bind, Connection) else bind
+    key = id(engine)
+    if key in _available:
+        return True
+
+    now = time.monotonic()
+    checked_at = _missing_checked_at.get(key)
+    if checked_at is None or now - checked_at >= SEARCH_TABLE_RECHECK_SECONDS:
+        if inspect(engine).has_table(SEARCH_TABLE):
+            _available.add(key)
+            _missing_checked_at.pop(key, None)
+            return True
+        _missing_checked_at[key] = now
+
+    logger.warning("%s 테이블이 없어 검색 색인/검색을 건너뜁니다. (README의 스키마 참고)", SEARCH_TABLE)
+    return False
+
+
+# -------------------------------
+# 색인 갱신 (호출한 쪽에서 commit)
+# -------------------------------
+def _upsert(db: Session, doc_id: int, post_id: int, title: str, body: str):
+    if db.get_bind().dialect.name == "sqlite":
+        db.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :doc_id"), {"doc_id": doc_id})
+        db.execute(
+            text(f"INSERT INTO {SEARCH_TABLE} (rowid, title, body, post_id) VALUES (:doc_id, :title, :body, :post_id)"),
+            {"doc_id": doc_id, "title": ngram_text(title), "body": ngram_text(body), "post_id": post_id},
+        )
+    else:
+        db.execute(
+            text(
+                f"INSERT INTO {SEARCH_TABLE} (doc_id, post_id, title, body) VALUES (:doc_id, :post_id, :title, :body) "
+                "ON DUPLICATE KEY UPDATE title = VALUES(title), body = VALUES(body)"
+            ),
+            {"doc_id": doc_id, "post_id": post_id, "title": title, "body": body},
+        )
+
+
+def index_post(db: Session, post):
+    if is_available(db):
+        _upsert(db, post.id, post.id, post.title, post.content)
+
+
+def index_comment(db: Session, comment):
+    if is_available(db):
+        _upsert(db, -comment.id, comment.post_id, "", comment.content)
+
+
+def remove_comment(db: Session, comment_id: int):
+    if not is_available(db):
+        return
+    column = "rowid" if db.get_bind().dialect.name == "sqlite" else "doc_id"
+    db.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE {column} = :doc_id"), {"doc_id": -comment_id})
+
+
+# 게시글과 댓글 문서 모두 삭제 (댓글 행을 지우기 전에 호출)
+def remove_post(db: Session, post_id: int):
+    if not is_available(db):
+        return
+    if db.get_bind().dialect.name == "sqlite":
+        # FTS5는 UNINDEXED 컬럼 조건이 전체 스캔이므로 rowid로 지운다
+        db.execute(
+            text(
+                f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :post_id "
+                "OR rowid IN (SELECT -id FROM comments WHERE post_id = :post_id)"
+            ),
+            {"post_id": post_id},
+        )
+    else:
+        db.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE post_id = :post_id"), {"post_id": post_id})
+
+
+# -------------------------------
+# 검색: (post_id, 점수) 순위 목록, 점수가 높을수록 관련도 높음
+# -------------------------------
+def search(db: Session, query: str, limit: int, offset: int) -> list[tuple[int, float]]:
+    if not is_available(db):
+        return []
+
+    if db.get_bind().dialect.name == "sqlite":
+        match = _fts5_query(query)
+        if match is None:
+            return []
+        # 후보는 최근 게시글 / 최근 댓글을 각각 SEARCH_CANDIDATE_LIMIT개씩, 그 안에서 bm25 순위
+        # (게시글 rowid = post_id라 큰 값이 최근, 댓글 rowid = -comment_id라 작은 값이 최근)
+        # bm25는 작을수록 관련도 높음, 게시글별로 가장 잘 맞는 문서 점수 사용
+        # (MATERIALIZED: 서브쿼리가 풀리면 bm25를 집계 안에서 쓸 수 없음)
+        score = f"bm25({SEARCH_TABLE}, {TITLE_WEIGHT}, 1.0)"
+        rows = db.execute(
+            text(
+                f"WITH post_docs AS MATERIALIZED ("
+                f" SELECT post_id, {score} AS score FROM {SEARCH_TABLE}"
+                f" WHERE {SEARCH_TABLE} MATCH :match AND rowid > 0 ORDER BY rowid DESC LIMIT :candidates"
+                f"), comment_docs AS MATERIALIZED ("
+                f" SELECT post_id, {score} AS score FROM {SEARCH_TABLE}"
+                f" WHERE {SEARCH_TABLE} MATCH :match AND rowid < 0 ORDER BY rowid ASC LIMIT :candidates"
+                "), matched AS ("
+                " SELECT post_id, score FROM post_docs UNION ALL SELECT post_id, score FROM comment_docs"
+                ") "
+                "SELECT post_id, MIN(score) AS score FROM matched "
+                "GROUP BY post_id ORDER BY score, post_id DESC LIMIT :limit OFFSET :offset"
+            ),
+            {"match": match, "candidates": SEARCH_CANDIDATE_LIMIT, "limit": limit, "offset": offset},
+        ).all()
+        return [(int(row.post_id), -row.score) for row in rows]
+
+    match = _mysql_query(query)
+    if match is None:
+        return []
+    # 관련도 상위 SEARCH_CANDIDATE_LIMIT개 문서 (InnoDB FTS는 ORDER BY MATCH ... LIMIT을 바로 처리)
+    rows = db.execute(
+        text(
+            "SELECT post_id, MAX(score) AS score FROM ("
+            " SELECT post_id, MATCH(title, body) AGAINST (:match IN BOOLEAN MODE) AS score"
+            f" FROM {SEARCH_TABLE} WHERE MATCH(title, body) AGAINST (:match IN BOOLEAN MODE)"
+            " ORDER BY score DESC LIMIT :candidates"
+            ") AS matched "
+            "GROUP BY post_id ORDER BY score DESC, post_id DESC LIMIT :limit OFFSET :offset"
+        ),
+        {"match": match, "candidates": SEARCH_CANDIDATE_LIMIT, "limit": limit, "offset": offset},
+    ).all()
+    return [(int(row.post_id), float(row.score)) for row in rows]
+
+
+# -------------------------------
+# 전체 재색인 (scripts/rebuild_search_index.py, 벤치마크)
+# -------------------------------
+def _bulk_insert(conn: Connection, docs: list[dict]):
+    if conn.dialect.name == "sqlite":
+        for doc in docs:
+            doc["title"] = ngram_text(doc["title"])
+            doc["body"] = ngram_text(doc["body"])
+        statement = f"INSERT INTO {SEARCH_TABLE} (rowid, title, body, post_id) VALUES (:doc_id, :title, :body, :post_id)"
+    else:
+        statement = f"INSERT INTO {SEARCH_TABLE} (doc_id, post_id, title, body) VALUES (:doc_id, :post_id, :title, :body)"
+    conn.execute(text(statement), docs)
+
+
+def rebuild(engine: Engine, batch_size: int = 5000) -> int:
+    with engine.begin() as conn:
+        create_table(conn)
+        conn.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+
+    sources = (
+        # (SELECT, 행 → 문서)
+        (
+            "SELECT id, title, content FROM posts WHERE id > :last_id ORDER BY id LIMIT :limit",
+            lambda row: {"doc_id": row.id, "post_id": row.id, "title": row.title, "body": row.content},
+        ),
+        (
+            "SELECT id, post_id, content FROM comments WHERE id > :last_id ORDER BY id LIMIT :limit",
+            lambda row: {"doc_id": -row.id, "post_id": row.post_id, "title": "", "body": row.content},
+        ),
+    )
+
+    indexed = 0
+    for select_sql, to_doc in sources:
+        last_id = 0
+        while True:
+            with engine.begin() as conn:
+                rows = conn.execute(text(select_sql), {"last_id": last_id, "limit": batch_size}).all()
+                if not rows:
+                    break
+                _bulk_insert(conn, [to_doc(row) for row in rows])
+            indexed += len(rows)
+            last_id = rows[-1].id
+    return indexed
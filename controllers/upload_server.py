@@ -0,0 +1,227 @@
+# controllers/upload_server.py
+# /uploads 정적 파일 제공 (브라우저/CDN 캐시 친화적으로)
+# - 강한 ETag: 내용 해시 파일명은 해시 그대로, 예전 파일명은 파일 내용 sha256
+# - 해시 파일명은 내용이 바뀌지 않으므로 Cache-Control: immutable (1년)
+# - If-None-Match / If-Modified-Since → 304, Range → 206 (If-Range 포함)
+# - 미리 압축된 파일(<파일>.br / .gz)이 있고 클라이언트가 받으면 그 파일을 전송
+# - 자주 요청되는 작은 파일은 메모리 LRU(바이트 한도)에 올려 디스크 읽기를 줄인다
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from functools import lru_cache
+
+from fastapi import HTTPException, Request
+from fastapi.responses import FileResponse, Response
+
+from controllers.upload_storage import UPLOAD_DIR
+
+UPLOAD_HOT_CACHE_BYTES = int(os.getenv("UPLOAD_HOT_CACHE_BYTES", str(64 * 1024 * 1024)))  # 0이면 끔
+UPLOAD_HOT_CACHE_MAX_FILE = int(os.getenv("UPLOAD_HOT_CACHE_MAX_FILE", str(1024 * 1024)))
+# 해시 파일명이 아닌 예전 업로드의 캐시 시간(초)
+UPLOAD_CACHE_MAX_AGE = int(os.getenv("UPLOAD_CACHE_MAX_AGE", "3600"))
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# <sha256>.<ext> 또는 축소본 <sha256>_w<폭>.webp
+_HASHED_NAME = re.compile(r"^([0-9a-f]{64}(?:_w\d+)?)\.[a-z0-9]+$")
+_SINGLE_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+_PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+class HotFileCache:
+    def __init__(self, max_bytes: int, max_file_bytes: int):
+        self.max_bytes = max_bytes
+        self.max_file_bytes = max_file_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size = 0
+        # 경로 -> (mtime_ns, 크기, 내용)
+        self._items: OrderedDict[str, tuple[int, int, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, path: str, st: os.stat_result) -> bytes | None:
+        with self._lock:
+            item = self._items.get(path)
+            # 파일이 바뀌었으면 (예전 파일명 덮어쓰기) 버린다
+            if item is None or item[0] != st.st_mtime_ns or item[1] != st.st_size:
+                if item is not None:
+                    self._discard(path)
+                self.misses += 1
+                return None
+
+            self._items.move_to_end(path)
+            self.hits += 1
+            return item[2]
+
+    def load(self, path: str, st: os.stat_result) -> bytes | None:
+        if not self.enabled or st.st_size > self.max_file_bytes:
+            return None
+
+        with open(path, "rb") as f:
+            body = f.read()
+        if len(body) != st.st_size:
+            return None
+
+        with self._lock:
+            self._discard(path)
+            self._items[path] = (st.st_mtime_ns, st.st_size, body)
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, (_, _, evicted) = self._items.popitem(last=False)
+                self._size -= len(evicted)
+        return body
+
+    def _discard(self, path: str):
+        item = self._items.pop(path, None)
+        if item is not None:
+            self._size -= len(item[2])
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "files": len(self._items),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+hot_cache = HotFileCache(UPLOAD_HOT_CACHE_BYTES, UPLOAD_HOT_CACHE_MAX_FILE)
+
+
+# 예전 파일명은 내용 해시를 계산 (같은 파일이면 다시 읽지 않도록 mtime/크기로 캐시)
+@lru_cache(maxsize=4096)
+def _content_etag(path: str, mtime_ns: int, size: int) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            digest.update(chunk)
+    return f'"{digest.hexdigest()}"'
+
+
+def _resolve(file_path: str) -> str:
+    # uploads/ 밖이나 숨김 파일(업로드 중 임시 파일)은 제공하지 않는다
+    normalized = os.path.normpath(file_path)
+    parts = normalized.split(os.sep)
+    if normalized.startswith(("..", os.sep)) or any(part.startswith(".") for part in parts):
+        raise HTTPException(404, "파일을 찾을 수 없습니다.")
+    return os.path.join(UPLOAD_DIR, normalized)
+
+
+def _stat(path: str) -> os.stat_result | None:
+    try:
+        st = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return st if os.path.isfile(path) else None
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # If-None-Match는 약한 비교 (W/ 무시)
+    candidates = [tag.strip() for tag in header.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def _not_modified(request: Request, etag: str, st: os.stat_result) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(st.st_mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _pick_precompressed(request: Request, path: str) -> tuple[str, str, os.stat_result] | None:
+    accepted = request.headers.get("accept-encoding", "")
+    for encoding, suffix in _PRECOMPRESSED:
+        if encoding in accepted:
+            st = _stat(path + suffix)
+            if st is not None:
+                return encoding, path + suffix, st
+    return None
+
+
+# 메모리에 있는 파일의 단일 Range 응답 (여러 구간 요청은 전체 응답)
+def _range_from_memory(request: Request, body: bytes, etag: str, headers: dict, media_type: str) -> Response:
+    http_range = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    match = _SINGLE_RANGE.match(http_range.strip()) if http_range else None
+    if match is None or (if_range is not None and if_range != etag):
+        return Response(body, headers=headers, media_type=media_type)
+
+    size = len(body)
+    first, last = match.groups()
+    if not first and not last:
+        return Response(body, headers=headers, media_type=media_type)
+    if first:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    else:
+        start, end = max(size - int(last), 0), size - 1
+    if start >= size or start > end:
+        return Response(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return Response(body[start : end + 1], status_code=206, headers=headers, media_type=media_type)
+
+
+def serve_upload(request: Request, file_path: str) -> Response:
+    path = _resolve(file_path)
+    st = _stat(path)
+    if st is None:
+        raise HTTPException(404, "파일을 찾을 수 없습니다.")
+
+    name = os.path.basename(path)
+    hashed = _HASHED_NAME.match(name)
+    etag = f'"{hashed.group(1)}"' if hashed else _content_etag(path, st.st_mtime_ns, st.st_size)
+    media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(st.st_mtime, usegmt=True),
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if hashed else f"public, max-age={UPLOAD_CACHE_MAX_AGE}",
+        "Accept-Ranges": "bytes",
+        "Vary": "Accept-Encoding",
+    }
+
+    # 미리 압축된 파일은 Range 요청이 아닐 때만 사용 (구간은 원본 기준)
+    # 조건부 요청은 선택된 표현의 ETag("<hash>-br")로 비교해야 304가 난다
+    precompressed = _pick_precompressed(request, path) if "range" not in request.headers else None
+    if precompressed is not None:
+        headers["ETag"] = f'{etag[:-1]}-{precompressed[0]}"'
+
+    if _not_modified(request, headers["ETag"], st):
+        return Response(status_code=304, headers=headers)
+
+    if precompressed is not None:
+        encoding, compressed_path, compressed_st = precompressed
+        headers["Content-Encoding"] = encoding
+        return FileResponse(compressed_path, headers=headers, media_type=media_type, stat_result=compressed_st)
+
+    body = hot_cache.get(path, st) if hot_cache.enabled else None
+    if body is None:
+        body = hot_cache.load(path, st)
+    if body is not None:
+        return _range_from_memory(request, body, etag, headers, media_type)
+
+    # 큰 파일은 디스크에서 스트리밍 (Range/If-Range는 FileResponse가 처리)
+    return FileResponse(path, headers=headers, media_type=media_type, stat_result=st)
+
+
+def get_hot_cache_stats() -> dict:
+    return hot_cache.stats()
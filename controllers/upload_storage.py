@@ -0,0 +1,289 @@
+# controllers/upload_storage.py
+# 업로드 이미지 저장소 (내용 주소 기반, 중복 제거)
+# 고정 크기 청크로 임시 파일에 쓰면서 sha256을 계산하고, 게시글 트랜잭션의 acquire() 다음 place()에서
+# uploads/ab/cd/<sha256>.<ext>로 원자적 rename 한다. 같은 내용이 이미 있으면 임시 파일만 지운다.
+# 업로드 크기와 상관없이 메모리 사용량은 청크 하나 분량으로 일정하다.
+#
+# 게시글이 참조하는 수는 upload_blobs.ref_count로 관리하고, 0이 되면 파일(축소본 포함)을 지운다.
+# 삭제와 중복 업로드가 겹치지 않도록
+# - acquire()로 upload_blobs 행을 쓴(잠근) 뒤, 커밋 전에 place()로 파일을 확인/배치하고
+# - remove_files()는 새 트랜잭션에서 행을 잠그고 참조가 없을 때만 지운다.
+# 트랜잭션 실패로 남은 파일/임시 파일은 scripts/sweep_uploads.py로 정리한다.
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import time
+from dataclasses import dataclass
+
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from controllers import image_derivatives
+from database import SessionLocal
+from models.upload_model import UploadBlobORM
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_DIR = "uploads"
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(10 * 1024 * 1024)))  # 기본 10MB
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# 파일 앞부분(매직 넘버)으로 판별하는 허용 이미지 형식
+_IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+_EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+}
+_TMP_PREFIX = ".upload_"
+# 원본 <sha256>.<ext> / 축소본 <sha256>_w<폭>.webp
+_BLOB_NAME = re.compile(r"^([0-9a-f]{64})(?:_w\d+)?\.[a-z0-9]+$")
+
+
+@dataclass(frozen=True)
+class StoredUpload:
+    sha256: str
+    url: str
+    content_type: str
+    size: int
+    # place()에서 url 위치로 옮길 임시 파일
+    tmp_path: str | None = None
+
+
+def sniff_image_type(head: bytes) -> str | None:
+    for signature, content_type in _IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(413, f"이미지는 최대 {UPLOAD_MAX_BYTES // (1024 * 1024)}MB까지 업로드할 수 있습니다.")
+
+
+def _check_declared_size(file: UploadFile):
+    # 파서가 알려준 크기가 있으면 복사 전에 바로 거절
+    if file.size is not None and file.size > UPLOAD_MAX_BYTES:
+        raise _too_large()
+
+
+# 해시 앞 4자리로 2단계 디렉터리 분산 (한 디렉터리에 파일이 몰리지 않도록)
+def blob_path(sha256: str, content_type: str) -> str:
+    return os.path.join(UPLOAD_DIR, sha256[:2], sha256[2:4], sha256 + _EXTENSIONS[content_type])
+
+
+# 업로드 파일을 임시 파일로 저장 (블로킹 I/O, 비동기 모드에서는 스레드풀에서 호출)
+# DB 참조 수 증가(acquire)와 최종 위치 배치(place)는 게시글 저장 트랜잭션 안에서 한다.
+def save_upload(file: UploadFile) -> StoredUpload:
+    _check_declared_size(file)
+
+    head = file.file.read(UPLOAD_CHUNK_SIZE)
+    content_type = sniff_image_type(head)
+    if content_type is None:
+        raise HTTPException(415, "지원하지 않는 이미지 형식입니다. (jpeg, png, gif, webp)")
+
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    # 같은 파일시스템에 임시 파일을 만들어야 rename이 원자적
+    fd, tmp_path = tempfile.mkstemp(dir=UPLOAD_DIR, prefix=_TMP_PREFIX, suffix=".part")
+    try:
+        digest = hashlib.sha256()
+        with os.fdopen(fd, "wb") as out:
+            written = 0
+            chunk = head
+            while chunk:
+                written += len(chunk)
+                if written > UPLOAD_MAX_BYTES:
+                    raise _too_large()
+                digest.update(chunk)
+                out.write(chunk)
+                chunk = file.file.read(UPLOAD_CHUNK_SIZE)
+
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    sha256 = digest.hexdigest()
+    file_path = blob_path(sha256, content_type)
+    return StoredUpload(
+        sha256=sha256, url=f"/{file_path}", content_type=content_type, size=written, tmp_path=tmp_path
+    )
+
+
+# 임시 파일을 최종 위치로 (이미 같은 내용이 있으면 임시 파일만 삭제)
+# acquire() 후 커밋 전에 호출 (블로킹 I/O, 비동기 모드에서는 스레드풀에서 호출)
+def place(stored: StoredUpload | None):
+    if stored is None or stored.tmp_path is None or not os.path.exists(stored.tmp_path):
+        return
+    file_path = stored.url.lstrip("/")
+    if os.path.exists(file_path):
+        os.remove(stored.tmp_path)
+    else:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        os.replace(stored.tmp_path, file_path)
+
+
+# 사용하지 않게 된 업로드의 임시 파일 삭제 (같은 이미지로 수정 등)
+def discard(stored: StoredUpload | None):
+    if stored is not None and stored.tmp_path is not None and os.path.exists(stored.tmp_path):
+        os.remove(stored.tmp_path)
+
+
+# -------------------------------
+# 참조 수 관리 (호출한 쪽에서 commit)
+# -------------------------------
+# 행을 먼저 갱신(잠금)한 뒤 place()로 파일을 배치하므로, 그 사이 remove_files()가 파일을 지울 수 없다.
+def acquire(db: Session, stored: StoredUpload):
+    _increase_ref(db, stored)
+
+
+# 행이 없으면 추가, 있으면 +1을 한 문장으로 (UPDATE 후 INSERT는 MySQL에서 갭 락 데드락이 날 수 있음)
+def _increase_ref(db: Session, stored: StoredUpload):
+    values = {
+        "sha256": stored.sha256,
+        "path": stored.url,
+        "content_type": stored.content_type,
+        "size": stored.size,
+        "ref_count": 1,
+    }
+    if db.get_bind().dialect.name == "sqlite":
+        stmt = sqlite_insert(UploadBlobORM).values(**values).on_conflict_do_update(
+            index_elements=[UploadBlobORM.sha256],
+            set_={"ref_count": UploadBlobORM.ref_count + 1},
+        )
+    else:
+        stmt = mysql_insert(UploadBlobORM).values(**values).on_duplicate_key_update(
+            ref_count=UploadBlobORM.ref_count + 1
+        )
+    db.execute(stmt)
+
+
+def _sha256_from_url(image_url: str) -> str | None:
+    name = os.path.splitext(os.path.basename(image_url))[0]
+    if len(name) == 64 and all(ch in "0123456789abcdef" for ch in name):
+        return name
+    return None
+
+
+# 참조 해제 후 더 이상 쓰이지 않는 파일 URL 목록 반환 (commit 후 remove_files로 삭제)
+# 저장소 도입 전의 이미지 URL(post_...)은 upload_blobs에 없으므로 건드리지 않는다.
+def release(db: Session, image_url: str | None) -> list[str]:
+    sha256 = _sha256_from_url(image_url) if image_url else None
+    if sha256 is None:
+        return []
+
+    db.execute(
+        update(UploadBlobORM)
+        .where(UploadBlobORM.sha256 == sha256, UploadBlobORM.ref_count > 0)
+        .values(ref_count=UploadBlobORM.ref_count - 1)
+    )
+    orphaned = db.execute(
+        delete(UploadBlobORM)
+        .where(UploadBlobORM.sha256 == sha256, UploadBlobORM.ref_count <= 0)
+    ).rowcount
+    if not orphaned:
+        return []
+
+    return [image_url] + [
+        image_derivatives.derivative_url(image_url, width)
+        for width in image_derivatives.IMAGE_DERIVATIVE_WIDTHS
+    ]
+
+
+def _blob_sha(url: str) -> str | None:
+    match = _BLOB_NAME.match(os.path.basename(url))
+    return match.group(1) if match else None
+
+
+def _unlink(url: str):
+    try:
+        os.remove(url.lstrip("/"))
+    except FileNotFoundError:
+        pass
+    except OSError:
+        logger.warning("업로드 파일 삭제 실패: %s", url)
+
+
+# 참조가 없을 때만 파일 삭제 (release()가 커밋된 뒤 호출, 블로킹 I/O)
+# 새 트랜잭션에서 행을 잠그는 DELETE로 같은 이미지의 acquire()와 순서를 맞춘 뒤 다시 확인한다.
+# - 먼저 acquire()한 요청이 있으면 행이 보이므로 지우지 않고
+# - 나중에 acquire()하는 요청은 이 트랜잭션이 끝날 때까지 기다렸다가 파일을 다시 배치한다.
+def remove_files(urls: list[str]):
+    groups: dict[str, list[str]] = {}
+    for url in urls:
+        sha256 = _blob_sha(url)
+        if sha256 is not None:
+            groups.setdefault(sha256, []).append(url)
+
+    for sha256, group in groups.items():
+        with SessionLocal() as db:
+            db.execute(delete(UploadBlobORM).where(UploadBlobORM.sha256 == sha256, UploadBlobORM.ref_count <= 0))
+            referenced = db.execute(select(UploadBlobORM.sha256).where(UploadBlobORM.sha256 == sha256)).first()
+            if referenced is None:
+                for url in group:
+                    _unlink(url)
+            db.commit()
+
+
+# -------------------------------
+# 정리 (scripts/sweep_uploads.py)
+# -------------------------------
+# upload_blobs 행이 없는 저장소 파일과 오래된 임시 파일 삭제
+# (업로드 중인 요청의 파일은 건너뛰도록 grace_seconds보다 오래된 것만)
+def sweep_orphans(grace_seconds: float = 3600, dry_run: bool = False) -> dict:
+    cutoff = time.time() - grace_seconds
+    result = {"orphaned_files": 0, "temp_files": 0}
+    if not os.path.isdir(UPLOAD_DIR):
+        return result
+
+    for name in os.listdir(UPLOAD_DIR):
+        path = os.path.join(UPLOAD_DIR, name)
+        if name.startswith(_TMP_PREFIX) and os.path.isfile(path) and os.path.getmtime(path) < cutoff:
+            result["temp_files"] += 1
+            if not dry_run:
+                _unlink(path)
+
+    # sha256 -> 오래된 파일 URL
+    candidates: dict[str, list[str]] = {}
+    for root, _, files in os.walk(UPLOAD_DIR):
+        if root == UPLOAD_DIR:
+            continue
+        for name in files:
+            path = os.path.join(root, name)
+            # 축소본 생성 중 남은 임시 파일
+            if name.startswith(image_derivatives.TMP_PREFIX):
+                if os.path.getmtime(path) < cutoff:
+                    result["temp_files"] += 1
+                    if not dry_run:
+                        _unlink(path)
+                continue
+            sha256 = _blob_sha(name)
+            if sha256 is not None and os.path.getmtime(path) < cutoff:
+                candidates.setdefault(sha256, []).append("/" + path)
+
+    shas = list(candidates)
+    with SessionLocal() as db:
+        referenced = set()
+        for start in range(0, len(shas), 500):
+            batch = shas[start : start + 500]
+            referenced.update(db.scalars(select(UploadBlobORM.sha256).where(UploadBlobORM.sha256.in_(batch))))
+
+    orphaned = [url for sha256 in shas if sha256 not in referenced for url in candidates[sha256]]
+    result["orphaned_files"] = len(orphaned)
+    if not dry_run:
+        # 지우기 직전에 행을 잠그고 다시 확인
+        remove_files(orphaned)
+    return result
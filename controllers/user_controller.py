@@ -1,10 +1,14 @@
 # controllers/user_controller.py
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
+from typing import TYPE_CHECKING
 from models.user_model import UserORM
 import re
 
-from auth_utils import create_access_token
+from auth_utils import create_access_token, invalidate_user
+
+if TYPE_CHECKING:  # 비동기 모드에서만 실제로 import (greenlet 필요)
+    from sqlalchemy.ext.asyncio import AsyncSession
 
 
 # ---------------------------
@@ -146,6 +150,7 @@ def update_profile(db: Session, user_id: int, data: dict):
     user.nickname = nickname
     db.commit()
     db.refresh(user)
+    invalidate_user(user_id)
 
     return {"message": "프로필 수정이 완료되었습니다.", "nickname": user.nickname}
 
@@ -175,5 +180,25 @@ def update_password(db: Session, user_id: int, data: dict):
     user.password = new_pw
     db.commit()
     db.refresh(user)
+    invalidate_user(user_id)
 
     return {"message": "비밀번호가 변경되었습니다."}
+
+
+# ---------------------------
+# 비동기 버전 (DB_ASYNC=1, AsyncSession)
+# ---------------------------
+async def login_async(db: "AsyncSession", data: dict):
+    return await db.run_sync(login, data)
+
+
+async def register_async(db: "AsyncSession", data: dict):
+    return await db.run_sync(register, data)
+
+
+async def update_profile_async(db: "AsyncSession", user_id: int, data: dict):
+    return await db.run_sync(update_profile, user_id, data)
+
+
+async def update_password_async(db: "AsyncSession", user_id: int, data: dict):
+    return await db.run_sync(update_password, user_id, data)
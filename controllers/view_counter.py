@@ -0,0 +1,99 @@
+# controllers/view_counter.py
+# 조회수 write-behind 누적기
+# 상세 조회마다 커밋하지 않고 메모리에 모아 두었다가 주기적으로
+# UPDATE posts SET views = views + :n 을 한 번에 실행한다.
+import logging
+import os
+import threading
+
+from sqlalchemy import bindparam, update
+
+from database import SessionLocal
+from models.post_model import PostORM
+
+logger = logging.getLogger(__name__)
+
+VIEW_FLUSH_INTERVAL = float(os.getenv("VIEW_FLUSH_INTERVAL", "5"))
+
+_posts = PostORM.__table__
+_INCREMENT_VIEWS = (
+    update(_posts)
+    .where(_posts.c.id == bindparam("b_post_id"))
+    .values(views=_posts.c.views + bindparam("b_count"))
+)
+
+
+class ViewCounter:
+    def __init__(self, flush_interval: float = VIEW_FLUSH_INTERVAL):
+        self.flush_interval = flush_interval
+        self._pending: dict[int, int] = {}
+        # flush 중인 값 (커밋 전까지는 조회 시 함께 더한다)
+        self._in_flight: dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def increment(self, post_id: int, count: int = 1):
+        with self._lock:
+            self._pending[post_id] = self._pending.get(post_id, 0) + count
+
+    # 아직 DB에 반영되지 않은 조회수
+    def pending(self, post_id: int) -> int:
+        with self._lock:
+            return self._pending.get(post_id, 0) + self._in_flight.get(post_id, 0)
+
+    def pending_many(self, post_ids) -> dict[int, int]:
+        with self._lock:
+            return {
+                post_id: self._pending.get(post_id, 0) + self._in_flight.get(post_id, 0)
+                for post_id in post_ids
+            }
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+                self._in_flight, self._pending = self._pending, {}
+                batch = dict(self._in_flight)
+
+            db = SessionLocal()
+            try:
+                db.execute(
+                    _INCREMENT_VIEWS,
+                    [{"b_post_id": post_id, "b_count": count} for post_id, count in batch.items()],
+                )
+                db.commit()
+            except Exception:
+                db.rollback()
+                logger.exception("조회수 반영 실패 (%d건), 다음 주기에 재시도", len(batch))
+                with self._lock:
+                    for post_id, count in batch.items():
+                        self._pending[post_id] = self._pending.get(post_id, 0) + count
+            finally:
+                db.close()
+                with self._lock:
+                    self._in_flight = {}
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="view-counter", daemon=True)
+        self._thread.start()
+
+    # 종료 시 남은 조회수까지 반영
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(self.flush_interval + 5)
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush()
+
+
+view_counter = ViewCounter()
@@ -1,21 +1,70 @@
 # database.py
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
-from typing import Generator
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.exc import OperationalError
+from typing import AsyncGenerator, Generator
+from starlette.requests import Request
 import pymysql
 from dotenv import load_dotenv
+import logging
 import os
+import time
+
+from metrics import get_pool_metrics, instrument_engine, instrumented_pool_class
+import slow_query_log
+
+logger = logging.getLogger(__name__)
+
 # MySQL 드라이버
 pymysql.install_as_MySQLdb()
 load_dotenv()  # 자동으로 .env 읽음
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# 커넥션 풀 / 로그 설정 (워커 수에 맞춰 조정)
+DB_ECHO = os.getenv("DB_ECHO", "0") == "1"   # SQL 로그 보고 싶으면 1
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # 초, MySQL wait_timeout보다 짧게
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1") == "1"
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+# 이름 → 엔진 (풀 지표 조회용)
+_engines: dict = {}
+
+
+# 풀 지표 조회 대상으로 등록 + SQL 실행 수/시간 측정 + 느린 쿼리 로그 (비동기 엔진은 sync_engine)
+def _register_engine(name: str, sync_engine):
+    _engines[name] = sync_engine
+    instrument_engine(sync_engine)
+    slow_query_log.attach(sync_engine)
+
+
+def _engine_options(url: str, pool_name: str, pool_base=QueuePool) -> dict:
+    options = {"echo": DB_ECHO}
+
+    # SQLite 메모리 DB는 전용 풀(SingletonThreadPool)을 그대로 사용
+    if make_url(url).get_backend_name() == "sqlite" and make_url(url).database in (None, "", ":memory:"):
+        return options
+
+    options.update(
+        poolclass=instrumented_pool_class(pool_base, pool_name),
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        pool_timeout=DB_POOL_TIMEOUT,
+    )
+    return options
+
+
 engine = create_engine(
     DATABASE_URL,
-    echo=True,          # SQL 로그 보고 싶으면 True
     future=True,
+    **_engine_options(DATABASE_URL, "primary"),
 )
+_register_engine("primary", engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -28,3 +77,159 @@ def get_db() -> Generator:
         yield db
     finally:
         db.close()
+
+
+# -------------------------------
+# 읽기 전용 복제본 (REPLICA_DATABASE_URL)
+# -------------------------------
+# 지정하지 않으면 읽기도 primary를 사용한다.
+REPLICA_DATABASE_URL = os.getenv("REPLICA_DATABASE_URL")
+# 자신이 쓰기를 한 뒤 이 시간(초) 동안은 primary에서 읽는다 (복제 지연 대비)
+READ_YOUR_WRITES_SECONDS = int(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+READ_PRIMARY_COOKIE = "read_primary"
+# 복제본 연결 실패 시 이 시간(초) 동안은 시도하지 않고 primary 사용
+REPLICA_RETRY_SECONDS = float(os.getenv("REPLICA_RETRY_SECONDS", "30"))
+
+replica_engine = None
+ReplicaSessionLocal = None
+_replica_down_until = 0.0
+
+if REPLICA_DATABASE_URL:
+    replica_engine = create_engine(
+        REPLICA_DATABASE_URL,
+        future=True,
+        **_engine_options(REPLICA_DATABASE_URL, "replica"),
+    )
+    ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+    _register_engine("replica", replica_engine)
+
+
+def _use_replica(request: Request, session_factory) -> bool:
+    if session_factory is None or request.cookies.get(READ_PRIMARY_COOKIE):
+        return False
+    return time.monotonic() >= _replica_down_until
+
+
+def _mark_replica_down(error: Exception):
+    global _replica_down_until
+    _replica_down_until = time.monotonic() + REPLICA_RETRY_SECONDS
+    logger.warning("복제본 연결 실패, %s초 동안 primary로 읽기: %s", REPLICA_RETRY_SECONDS, error)
+
+
+# 읽기 전용 API용 세션 (복제본 → 실패 시 primary)
+def get_read_db(request: Request) -> Generator:
+    db = None
+    if _use_replica(request, ReplicaSessionLocal):
+        db = ReplicaSessionLocal()
+        try:
+            db.connection()
+        except OperationalError as e:
+            db.close()
+            db = None
+            _mark_replica_down(e)
+
+    if db is None:
+        db = SessionLocal()
+    # 응답 캐시 키에 사용 (복제본 응답을 primary 응답으로 재사용하지 않도록)
+    request.state.read_source = "primary" if db.get_bind() is engine else "replica"
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# -------------------------------
+# 비동기 모드 (DB_ASYNC=1)
+# -------------------------------
+# 라우터가 async def로 동작하고 AsyncSession을 사용한다.
+# 백그라운드 작업(AI 댓글, 조회수 반영)은 계속 동기 SessionLocal을 사용.
+DB_ASYNC = os.getenv("DB_ASYNC", "0") == "1"
+
+
+def _to_async_url(url: str) -> str:
+    for sync_prefix, async_prefix in (
+        ("mysql+pymysql://", "mysql+aiomysql://"),
+        ("mysql://", "mysql+aiomysql://"),
+        ("sqlite+pysqlite://", "sqlite+aiosqlite://"),
+        ("sqlite://", "sqlite+aiosqlite://"),
+    ):
+        if url.startswith(sync_prefix):
+            return async_prefix + url[len(sync_prefix):]
+    return url
+
+
+# 지정하지 않으면 DATABASE_URL의 드라이버만 비동기용으로 바꿔 사용
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _to_async_url(DATABASE_URL or "")
+
+async_engine = None
+AsyncSessionLocal = None
+
+if DB_ASYNC:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        **_engine_options(ASYNC_DATABASE_URL, "async", AsyncAdaptedQueuePool),
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False)
+    _register_engine("async", async_engine.sync_engine)
+
+
+async def get_async_db() -> AsyncGenerator:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+AsyncReplicaSessionLocal = None
+
+if DB_ASYNC and REPLICA_DATABASE_URL:
+    ASYNC_REPLICA_DATABASE_URL = os.getenv("ASYNC_REPLICA_DATABASE_URL") or _to_async_url(REPLICA_DATABASE_URL)
+    async_replica_engine = create_async_engine(
+        ASYNC_REPLICA_DATABASE_URL,
+        **_engine_options(ASYNC_REPLICA_DATABASE_URL, "async_replica", AsyncAdaptedQueuePool),
+    )
+    AsyncReplicaSessionLocal = async_sessionmaker(async_replica_engine, autoflush=False)
+    _register_engine("async_replica", async_replica_engine.sync_engine)
+
+
+async def get_async_read_db(request: Request) -> AsyncGenerator:
+    db = None
+    if _use_replica(request, AsyncReplicaSessionLocal):
+        db = AsyncReplicaSessionLocal()
+        try:
+            await db.connection()
+        except OperationalError as e:
+            await db.close()
+            db = None
+            _mark_replica_down(e)
+
+    if db is None:
+        db = AsyncSessionLocal()
+    request.state.read_source = "primary" if db.bind is async_engine else "replica"
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+# -------------------------------
+# 커넥션 풀 상태
+# -------------------------------
+def pool_status() -> dict:
+    status = {}
+    for name, eng in _engines.items():
+        pool = eng.pool
+        info = {"pool_class": type(pool).__name__}
+        # QueuePool 계열만 크기/오버플로 정보가 있음
+        if hasattr(pool, "overflow"):
+            info.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=pool.overflow(),
+                max_overflow=DB_MAX_OVERFLOW,
+            )
+        info.update(get_pool_metrics(name).snapshot())
+        status[name] = info
+    return status
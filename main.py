@@ -1,13 +1,66 @@
 # main.py
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+import logging
+import os
+import threading
+import time
+
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from auth_utils import require_internal_token
+from database import DB_ASYNC, REPLICA_DATABASE_URL, READ_PRIMARY_COOKIE, READ_YOUR_WRITES_SECONDS
+
+if DB_ASYNC:
+    from routers.async_user_router import router as user_router
+    from routers.async_post_router import router as post_router
+    from routers.async_comment_router import router as comment_router
+else:
+    from routers.user_router import router as user_router
+    from routers.post_router import router as post_router
+    from routers.comment_router import router as comment_router
+from routers.ai_router import router as ai_router
+from routers.internal_router import router as internal_router
+from routers.uploads_router import router as uploads_router
+from controllers import ai_comment_worker, ai_controller, image_derivatives
+from controllers.upload_storage import UPLOAD_MAX_BYTES
+from controllers.view_counter import view_counter
+from metrics import render_prometheus, request_metrics
+
+logger = logging.getLogger(__name__)
+
+# AI_WARMUP=1 이면 시작 시 백그라운드에서 더미 생성 1회 (모델 로딩 포함)
+AI_WARMUP = os.getenv("AI_WARMUP", "0") == "1"
+
 
-from routers.user_router import router as user_router
-from routers.post_router import router as post_router
-from routers.comment_router import router as comment_router
+def _warmup_ai_model():
+    try:
+        ai_controller.warmup()
+    except Exception:
+        logger.exception("AI 모델 워밍업 실패")
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    ai_controller.startup()
+    if AI_WARMUP:
+        threading.Thread(target=_warmup_ai_model, name="ai-warmup", daemon=True).start()
+
+    # AI 자동 댓글 백그라운드 워커 (pending 게시글 주기적 재등록 포함)
+    ai_comment_worker.start()
+    # 조회수 주기적 반영
+    view_counter.start()
+    # 업로드 이미지 축소본 생성 프로세스 풀
+    image_derivatives.start()
+    yield
+    image_derivatives.stop()
+    view_counter.stop()
+    ai_comment_worker.stop()
+    ai_controller.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS
 app.add_middleware(
@@ -21,10 +74,95 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 업로드 이미지 제공
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+# 쓰기 성공 직후에는 잠시 primary에서 읽도록 쿠키 표시 (read-your-writes)
+if REPLICA_DATABASE_URL:
+    @app.middleware("http")
+    async def mark_recent_write(request: Request, call_next):
+        response = await call_next(request)
+        if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+            response.set_cookie(
+                READ_PRIMARY_COOKIE,
+                "1",
+                max_age=READ_YOUR_WRITES_SECONDS,
+                httponly=True,
+                samesite="lax",
+            )
+        return response
+
+# 업로드 한도를 넘는 multipart 요청은 본문을 파싱하기 전에 거절
+# (제목/내용 등 폼 필드 몫으로 여유 64KB)
+_MULTIPART_MAX_BYTES = UPLOAD_MAX_BYTES + 64 * 1024
+
+
+@app.middleware("http")
+async def reject_oversized_upload(request: Request, call_next):
+    content_type = request.headers.get("content-type", "")
+    content_length = request.headers.get("content-length")
+    if (
+        content_type.startswith("multipart/form-data")
+        and content_length
+        and content_length.isdigit()
+        and int(content_length) > _MULTIPART_MAX_BYTES
+    ):
+        return JSONResponse(
+            status_code=413,
+            content={"detail": f"이미지는 최대 {UPLOAD_MAX_BYTES // (1024 * 1024)}MB까지 업로드할 수 있습니다."},
+        )
+    return await call_next(request)
+
+
+# 라우트 템플릿(/api/posts/{post_id})으로 묶어 지표 라벨 수를 제한
+def _route_label(scope) -> str:
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    template = route.path_format
+    # include_router(prefix=...)로 붙은 접두어는 route에 없을 수 있어 실제 경로에서 복원
+    try:
+        matched = template.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        return template
+    path = scope["path"]
+    return path[: len(path) - len(matched)] + template if path.endswith(matched) else template
+
+
+# 라우트별 응답 시간, 상태 코드, 처리 중 요청 수, 요청당 SQL 수/시간 (GET /metrics)
+# 가장 바깥 미들웨어로 두어 위의 미들웨어가 거절한 요청도 집계한다
+# (스트리밍 응답(SSE)의 응답 시간은 헤더를 보낼 때까지)
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    method = request.method
+    stats, token = request_metrics.start(method)
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        request_metrics.finish(
+            method,
+            request.url.path,
+            _route_label(request.scope),
+            status,
+            time.perf_counter() - started,
+            stats,
+            token,
+        )
+
+
+# Prometheus 수집용 (내부 API와 같은 X-Internal-Token 필요)
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_internal_token)])
+def metrics():
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+# 업로드 이미지 제공 (ETag/304, 해시 파일명 immutable 캐시, Range)
+app.include_router(uploads_router)
 
 # 🔥 모든 라우터는 /api 아래에 붙인다
 app.include_router(user_router, prefix="/api")
 app.include_router(post_router, prefix="/api")
 app.include_router(comment_router, prefix="/api")
+app.include_router(ai_router, prefix="/api")
+app.include_router(internal_router, prefix="/api")
@@ -0,0 +1,287 @@
+# metrics.py
+# 운영 지표 수집용 도구 (히스토그램, 커넥션 풀 지표, 요청/SQL 지표)
+import bisect
+import contextvars
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# 밀리초 단위 기본 버킷
+DEFAULT_LATENCY_BUCKETS_MS = (0.1, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)  # 마지막 칸은 +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    # 누적(cumulative) 버킷 카운트
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+
+        cumulative = {}
+        running = 0
+        for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+            running += bucket_count
+            cumulative[str(bound)] = running
+
+        return {"buckets": cumulative, "sum": round(total, 3), "count": count}
+
+
+# -------------------------------
+# 커넥션 풀 지표
+# -------------------------------
+class PoolMetrics:
+    def __init__(self, name: str):
+        self.name = name
+        self.checkouts = 0
+        # 유휴 커넥션이 없어 새로 연결하거나 반납을 기다린 체크아웃
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.timeouts = 0
+        self.checkout_latency_ms = Histogram()
+        self._lock = threading.Lock()
+
+    def record_checkout(self, seconds: float, waited: bool):
+        self.checkout_latency_ms.observe(seconds * 1000)
+        with self._lock:
+            self.checkouts += 1
+            if waited:
+                self.waits += 1
+                self.wait_seconds += seconds
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "checkouts": self.checkouts,
+            "waits": self.waits,
+            "wait_seconds_total": round(self.wait_seconds, 6),
+            "timeouts": self.timeouts,
+            "checkout_latency_ms": self.checkout_latency_ms.snapshot(),
+        }
+
+
+_pool_metrics: dict[str, PoolMetrics] = {}
+
+
+def get_pool_metrics(name: str) -> PoolMetrics:
+    if name not in _pool_metrics:
+        _pool_metrics[name] = PoolMetrics(name)
+    return _pool_metrics[name]
+
+
+# 풀 클래스에 체크아웃 지연시간 측정을 덧씌운 서브클래스 생성
+# (engine.dispose 등으로 풀이 재생성돼도 같은 지표를 쓰도록 클래스 속성에 보관)
+def instrumented_pool_class(base, name: str):
+    from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+    metrics = get_pool_metrics(name)
+
+    class InstrumentedPool(base):
+        def _do_get(self):
+            waited = self.checkedin() == 0
+            started = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except PoolTimeoutError:
+                metrics.record_timeout()
+                raise
+            metrics.record_checkout(time.perf_counter() - started, waited)
+            return connection
+
+    InstrumentedPool.__name__ = f"Instrumented{base.__name__}"
+    return InstrumentedPool
+
+
+# -------------------------------
+# 요청 / SQL 지표 (GET /metrics, Prometheus 텍스트 형식)
+# -------------------------------
+# 요청 하나에서 실행한 SQL이 이 개수를 넘으면 경고 로그 (N+1 의심, 0이면 끔)
+SQL_QUERY_WARN_THRESHOLD = int(os.getenv("SQL_QUERY_WARN_THRESHOLD", "20"))
+
+# 요청당 SQL 개수 버킷
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class RequestQueryStats:
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+# 현재 요청의 SQL 집계 (요청 밖의 백그라운드 작업에서는 None)
+# 동기 라우터는 스레드풀에서 실행되지만 컨텍스트가 복사되므로 같은 객체에 누적된다
+_current_query_stats: contextvars.ContextVar[RequestQueryStats | None] = contextvars.ContextVar(
+    "current_query_stats", default=None
+)
+
+
+class RequestMetrics:
+    def __init__(self):
+        # (method, route, status) -> 요청 수
+        self.requests: dict[tuple[str, str, int], int] = {}
+        # (method, route) -> 히스토그램
+        self.latency_ms: dict[tuple[str, str], Histogram] = {}
+        self.queries: dict[tuple[str, str], Histogram] = {}
+        self.query_time_ms: dict[tuple[str, str], Histogram] = {}
+        self.query_warnings: dict[tuple[str, str], int] = {}
+        # method -> 처리 중인 요청 수
+        self.in_flight: dict[str, int] = {}
+        # 요청 밖(백그라운드 작업 포함) 전체 SQL
+        self.sql_queries = 0
+        self.sql_latency_ms = Histogram()
+        self._lock = threading.Lock()
+
+    def start(self, method: str) -> tuple[RequestQueryStats, contextvars.Token]:
+        with self._lock:
+            self.in_flight[method] = self.in_flight.get(method, 0) + 1
+        stats = RequestQueryStats()
+        return stats, _current_query_stats.set(stats)
+
+    def finish(
+        self, method: str, path: str, route: str, status: int, seconds: float,
+        stats: RequestQueryStats, token: contextvars.Token,
+    ):
+        _current_query_stats.reset(token)
+        key = (method, route)
+        with self._lock:
+            self.in_flight[method] -= 1
+            self.requests[(method, route, status)] = self.requests.get((method, route, status), 0) + 1
+            if key not in self.latency_ms:
+                self.latency_ms[key] = Histogram()
+                self.queries[key] = Histogram(QUERY_COUNT_BUCKETS)
+                self.query_time_ms[key] = Histogram()
+            warn = 0 < SQL_QUERY_WARN_THRESHOLD < stats.count
+            if warn:
+                self.query_warnings[key] = self.query_warnings.get(key, 0) + 1
+
+        self.latency_ms[key].observe(seconds * 1000)
+        self.queries[key].observe(stats.count)
+        self.query_time_ms[key].observe(stats.seconds * 1000)
+        if warn:
+            logger.warning(
+                "요청 하나에서 SQL %d회 실행 (임계값 %d, N+1 의심): %s %s (%s), SQL %.1fms / 전체 %.1fms",
+                stats.count, SQL_QUERY_WARN_THRESHOLD, method, path, route, stats.seconds * 1000, seconds * 1000,
+            )
+
+    def record_query(self, seconds: float):
+        stats = _current_query_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += seconds
+        self.sql_latency_ms.observe(seconds * 1000)
+        with self._lock:
+            self.sql_queries += 1
+
+
+request_metrics = RequestMetrics()
+
+
+# 엔진에서 실행되는 모든 SQL의 개수/시간 측정 (비동기 엔진은 sync_engine을 전달)
+def instrument_engine(engine):
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        request_metrics.record_query(time.perf_counter() - context._query_started)
+
+
+def _label_value(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels) -> str:
+    return ",".join(f'{name}="{_label_value(value)}"' for name, value in labels.items())
+
+
+def _render_histogram(lines: list[str], name: str, help_text: str, histograms: dict):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for (method, route), histogram in histograms.items():
+        snapshot = histogram.snapshot()
+        labels = _labels(method=method, route=route)
+        for bound, count in snapshot["buckets"].items():
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+        lines.append(f"{name}_sum{{{labels}}} {snapshot['sum']}")
+        lines.append(f"{name}_count{{{labels}}} {snapshot['count']}")
+
+
+def render_prometheus() -> str:
+    m = request_metrics
+    with m._lock:
+        requests = dict(m.requests)
+        in_flight = dict(m.in_flight)
+        warnings = dict(m.query_warnings)
+        latency, queries, query_time = dict(m.latency_ms), dict(m.queries), dict(m.query_time_ms)
+        sql_queries = m.sql_queries
+
+    lines = [
+        "# HELP http_requests_total 처리한 HTTP 요청 수",
+        "# TYPE http_requests_total counter",
+    ]
+    for (method, route, status), count in sorted(requests.items()):
+        lines.append(f"http_requests_total{{{_labels(method=method, route=route, status=status)}}} {count}")
+
+    lines += ["# HELP http_requests_in_flight 처리 중인 HTTP 요청 수", "# TYPE http_requests_in_flight gauge"]
+    for method, count in sorted(in_flight.items()):
+        lines.append(f"http_requests_in_flight{{{_labels(method=method)}}} {count}")
+
+    _render_histogram(lines, "http_request_duration_ms", "라우트별 응답 시간(ms)", latency)
+    _render_histogram(lines, "http_request_sql_queries", "요청당 SQL 실행 수", queries)
+    _render_histogram(lines, "http_request_sql_duration_ms", "요청당 SQL 실행 시간 합(ms)", query_time)
+
+    lines += [
+        "# HELP http_request_sql_warnings_total SQL 수가 SQL_QUERY_WARN_THRESHOLD를 넘은 요청 수",
+        "# TYPE http_request_sql_warnings_total counter",
+    ]
+    for (method, route), count in sorted(warnings.items()):
+        lines.append(f"http_request_sql_warnings_total{{{_labels(method=method, route=route)}}} {count}")
+
+    sql_latency = m.sql_latency_ms.snapshot()
+    lines += [
+        "# HELP db_queries_total 실행한 SQL 수 (백그라운드 작업 포함)",
+        "# TYPE db_queries_total counter",
+        f"db_queries_total {sql_queries}",
+        "# HELP db_query_duration_ms SQL 하나의 실행 시간(ms)",
+        "# TYPE db_query_duration_ms histogram",
+    ]
+    for bound, count in sql_latency["buckets"].items():
+        lines.append(f'db_query_duration_ms_bucket{{le="{bound}"}} {count}')
+    lines.append(f"db_query_duration_ms_sum {sql_latency['sum']}")
+    lines.append(f"db_query_duration_ms_count {sql_latency['count']}")
+
+    lines += [
+        "# HELP db_pool_checkouts_total 커넥션 풀 체크아웃 수",
+        "# TYPE db_pool_checkouts_total counter",
+    ]
+    for name, pool in sorted(_pool_metrics.items()):
+        lines.append(f"db_pool_checkouts_total{{{_labels(pool=name)}}} {pool.checkouts}")
+    lines += ["# HELP db_pool_timeouts_total 커넥션 풀 대기 시간 초과 수", "# TYPE db_pool_timeouts_total counter"]
+    for name, pool in sorted(_pool_metrics.items()):
+        lines.append(f"db_pool_timeouts_total{{{_labels(pool=name)}}} {pool.timeouts}")
+
+    return "\n".join(lines) + "\n"
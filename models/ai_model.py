@@ -3,3 +3,5 @@ from pydantic import BaseModel
 class CommentGenRequest(BaseModel):
     post_title: str
     post_content: str
+    # 같은 글이라도 매번 새로 샘플링하고 싶으면 False
+    use_cache: bool = True
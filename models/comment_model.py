@@ -1,5 +1,5 @@
 # models/comment_model.py
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from datetime import datetime
 from database import Base
 from pydantic import BaseModel
@@ -18,6 +18,9 @@ class CommentORM(Base):
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, nullable=True)
 
+    # 게시글별 댓글 커서 페이지네이션용
+    __table_args__ = (Index("ix_comments_post_id_id", "post_id", "id"),)
+
 # ------------------------------
 # Pydantic 스키마
 # ------------------------------
@@ -0,0 +1,15 @@
+# models/like_model.py
+from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from datetime import datetime
+from database import Base
+
+# ------------------------------
+# SQLAlchemy ORM 모델
+# ------------------------------
+# (user_id, post_id) 한 쌍이 좋아요 1개
+class PostLikeORM(Base):
+    __tablename__ = "post_likes"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    post_id = Column(Integer, ForeignKey("posts.id"), primary_key=True, index=True)
+    created_at = Column(DateTime, default=datetime.now)
@@ -5,6 +5,9 @@ from database import Base
 from pydantic import BaseModel, Field
 from typing import Optional
 
+# 목록 화면용 본문 요약 최대 길이
+EXCERPT_MAX_LENGTH = 100
+
 # ------------------------------
 # SQLAlchemy ORM 모델
 # ------------------------------
@@ -14,12 +17,21 @@ class PostORM(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(26), nullable=False)
     content = Column(Text, nullable=False)
+    excerpt = Column(String(EXCERPT_MAX_LENGTH), nullable=True)
     author = Column(String(50), default="익명")
     image = Column(String(255), nullable=True)
+    # 피드용 축소 이미지 (백그라운드에서 생성되며, 없으면 원본 사용)
+    image_thumb = Column(String(255), nullable=True)
     views = Column(Integer, default=0)
     likes = Column(Integer, default=0)
+    # 댓글 수 (댓글 등록/삭제와 같은 트랜잭션에서 갱신)
+    comment_count = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, nullable=True)
+    # AI 자동 댓글 상태: pending / processing / done / failed
+    ai_comment_status = Column(String(10), nullable=True, index=True)
+    # 워커가 processing으로 선점한 시각 (lease 만료 판단)
+    ai_comment_claimed_at = Column(DateTime, nullable=True)
 
 
 # ------------------------------
@@ -44,8 +56,29 @@ class Post(BaseModel):
     content: str
     author: str
     image: Optional[str]
+    image_thumb: Optional[str] = None
+    views: int
+    likes: int
+    comment_count: int = 0
+    created_at: datetime
+    updated_at: Optional[datetime]
+    ai_comment_status: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+# 목록(피드) 전용 스키마: 본문 대신 요약만 포함
+class PostSummary(BaseModel):
+    id: int
+    title: str
+    excerpt: Optional[str]
+    author: str
+    image: Optional[str]
+    image_thumb: Optional[str] = None
     views: int
     likes: int
+    comment_count: int = 0
     created_at: datetime
     updated_at: Optional[datetime]
 
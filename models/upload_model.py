@@ -0,0 +1,18 @@
+# models/upload_model.py
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from database import Base
+
+# ------------------------------
+# SQLAlchemy ORM 모델
+# ------------------------------
+# 업로드 파일 1개 = 내용(sha256) 1개, 같은 이미지를 쓰는 게시글 수만큼 ref_count
+class UploadBlobORM(Base):
+    __tablename__ = "upload_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    path = Column(String(255), nullable=False)
+    content_type = Column(String(50), nullable=False)
+    size = Column(Integer, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.now)
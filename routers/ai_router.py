@@ -1,10 +1,30 @@
 # routers/ai_router.py
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 from models.ai_model import CommentGenRequest
-from controllers.ai_controller import generate_comment
+from controllers.ai_controller import (
+    generate_comment, stream_comment, get_readiness, get_cache_stats,
+)
 
 router = APIRouter(prefix="/ai", tags=["AI"])
 
 @router.post("/generate-comment")
 def generate_comment_route(data: CommentGenRequest):
     return generate_comment(data)
+
+# 생성되는 토큰을 SSE로 바로 전송 (event: token → done)
+@router.post("/generate-comment/stream")
+def stream_comment_route(data: CommentGenRequest):
+    return StreamingResponse(
+        stream_comment(data),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/ready")
+def readiness_route():
+    return get_readiness()
+
+@router.get("/cache")
+def cache_stats_route():
+    return get_cache_stats()
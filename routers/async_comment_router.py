@@ -0,0 +1,64 @@
+# routers/async_comment_router.py
+# DB_ASYNC=1 일 때 사용하는 비동기 라우터 (경로는 comment_router와 동일)
+from fastapi import APIRouter, Body, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import get_async_db, get_async_read_db
+from controllers import comment_controller, response_cache
+from controllers.cursor import CURSOR_ID_MAX
+from models.comment_model import CommentCreate
+from auth_utils import get_current_user_async
+from models.user_model import UserORM
+
+router = APIRouter(prefix="/posts", tags=["Comments"])
+
+
+# 댓글 목록 (로그인 불필요, 응답 캐시)
+@router.get("/{post_id}/comments")
+async def get_comments(
+    request: Request,
+    post_id: int,
+    limit: int = Query(comment_controller.COMMENT_DEFAULT_LIMIT, ge=1, le=comment_controller.COMMENT_MAX_LIMIT),
+    after: str | None = Query(None),
+    after_id: int | None = Query(None, ge=0, le=CURSOR_ID_MAX),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    return await response_cache.cached_async(
+        request,
+        [response_cache.comments_namespace(post_id)],
+        lambda: comment_controller.get_comments_async(db, post_id, limit, after, after_id),
+    )
+
+
+# 댓글 등록 (로그인 필요)
+@router.post("/{post_id}/comments")
+async def add_comment(
+    post_id: int,
+    data: CommentCreate = Body(...),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserORM = Depends(get_current_user_async),
+):
+    return await comment_controller.add_comment_async(db, post_id, data, current_user)
+
+
+# 댓글 수정
+@router.put("/{post_id}/comments/{comment_id}")
+async def update_comment(
+    post_id: int,
+    comment_id: int,
+    data: dict = Body(...),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserORM = Depends(get_current_user_async),
+):
+    return await comment_controller.update_comment_async(db, post_id, comment_id, current_user, data)
+
+
+# 댓글 삭제
+@router.delete("/{post_id}/comments/{comment_id}")
+async def delete_comment(
+    post_id: int,
+    comment_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserORM = Depends(get_current_user_async),
+):
+    return await comment_controller.delete_comment_async(db, post_id, comment_id, current_user)
@@ -0,0 +1,99 @@
+# routers/async_post_router.py
+# DB_ASYNC=1 일 때 사용하는 비동기 라우터 (경로는 post_router와 동일)
+from fastapi import APIRouter, UploadFile, File, Form, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from controllers import post_controller, response_cache
+from models.post_model import PostCreate, PostUpdate
+from database import get_async_db, get_async_read_db
+from auth_utils import get_current_user_async, get_current_user_optional_async
+from models.user_model import UserORM
+
+router = APIRouter(prefix="/posts", tags=["Posts"])
+
+
+# 응답 캐시 (글/좋아요/댓글 쓰기 시 무효화, ETag로 304)
+@router.get("")
+async def get_all_posts(
+    request: Request,
+    limit: int = Query(post_controller.FEED_DEFAULT_LIMIT, ge=1, le=post_controller.FEED_MAX_LIMIT),
+    cursor: str | None = Query(None),
+    include_count: bool = Query(False),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: UserORM | None = Depends(get_current_user_optional_async),
+):
+    return await response_cache.cached_async(
+        request,
+        [response_cache.FEED],
+        lambda: post_controller.get_all_posts_async(db, limit, cursor, include_count, current_user),
+        current_user,
+    )
+
+
+# 검색 (/{post_id}보다 먼저 선언해야 "search"가 post_id로 잡히지 않음)
+@router.get("/search")
+async def search_posts(
+    q: str = Query(..., min_length=1, max_length=post_controller.SEARCH_QUERY_MAX_LENGTH),
+    limit: int = Query(post_controller.SEARCH_DEFAULT_LIMIT, ge=1, le=post_controller.SEARCH_MAX_LIMIT),
+    cursor: str | None = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: UserORM | None = Depends(get_current_user_optional_async),
+):
+    return await post_controller.search_posts_async(db, q, limit, cursor, current_user)
+
+
+@router.get("/{post_id}")
+async def get_post_detail(
+    post_id: int,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: UserORM | None = Depends(get_current_user_optional_async),
+):
+    return await post_controller.get_post_detail_async(db, post_id, current_user)
+
+
+@router.get("/{post_id}/ai-comment")
+async def get_ai_comment_status(post_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await post_controller.get_ai_comment_status_async(db, post_id)
+
+
+@router.post("")
+async def create_post(
+    title: str = Form(...),
+    content: str = Form(...),
+    file: UploadFile | None = File(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserORM = Depends(get_current_user_async),
+):
+    data = PostCreate(title=title, content=content, author=current_user.nickname)
+    return await post_controller.create_post_async(db, data, file)
+
+
+@router.put("/{post_id}")
+async def update_post(
+    post_id: int,
+    title: str = Form(...),
+    content: str = Form(...),
+    file: UploadFile | None = File(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserORM = Depends(get_current_user_async),
+):
+    data = PostUpdate(title=title, content=content)
+    return await post_controller.update_post_async(db, post_id, data, file, current_user)
+
+
+@router.delete("/{post_id}")
+async def delete_post(
+    post_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserORM = Depends(get_current_user_async),
+):
+    return await post_controller.delete_post_async(db, post_id, current_user)
+
+
+@router.post("/{post_id}/like")
+async def toggle_like(
+    post_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserORM = Depends(get_current_user_async),
+):
+    return await post_controller.toggle_like_async(db, post_id, current_user)
@@ -0,0 +1,39 @@
+# routers/async_user_router.py
+# DB_ASYNC=1 일 때 사용하는 비동기 라우터 (경로는 user_router와 동일)
+from fastapi import APIRouter, Body, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from controllers import user_controller
+from database import get_async_db
+from auth_utils import get_current_user_async
+from models.user_model import UserORM
+
+router = APIRouter(prefix="/users", tags=["Users"])
+
+
+@router.post("/login")
+async def login(data: dict = Body(...), db: AsyncSession = Depends(get_async_db)):
+    return await user_controller.login_async(db, data)
+
+
+@router.post("/register")
+async def register(data: dict = Body(...), db: AsyncSession = Depends(get_async_db)):
+    return await user_controller.register_async(db, data)
+
+
+@router.put("/me/profile")
+async def update_profile(
+    data: dict = Body(...),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserORM = Depends(get_current_user_async),
+):
+    return await user_controller.update_profile_async(db, current_user.id, data)
+
+
+@router.put("/me/password")
+async def update_password(
+    data: dict = Body(...),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserORM = Depends(get_current_user_async),
+):
+    return await user_controller.update_password_async(db, current_user.id, data)
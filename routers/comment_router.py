@@ -1,9 +1,10 @@
 # routers/comment_router.py
-from fastapi import APIRouter, Body, Depends
+from fastapi import APIRouter, Body, Depends, Query, Request
 from sqlalchemy.orm import Session
 
-from database import get_db
-from controllers import comment_controller
+from database import get_db, get_read_db
+from controllers import comment_controller, response_cache
+from controllers.cursor import CURSOR_ID_MAX
 from models.comment_model import CommentCreate
 from auth_utils import get_current_user
 from models.user_model import UserORM
@@ -11,10 +12,21 @@ from models.user_model import UserORM
 router = APIRouter(prefix="/posts", tags=["Comments"])
 
 
-# 댓글 목록 (로그인 불필요)
+# 댓글 목록 (로그인 불필요, 응답 캐시)
 @router.get("/{post_id}/comments")
-def get_comments(post_id: int, db: Session = Depends(get_db)):
-    return comment_controller.get_comments(db, post_id)
+def get_comments(
+    request: Request,
+    post_id: int,
+    limit: int = Query(comment_controller.COMMENT_DEFAULT_LIMIT, ge=1, le=comment_controller.COMMENT_MAX_LIMIT),
+    after: str | None = Query(None),
+    after_id: int | None = Query(None, ge=0, le=CURSOR_ID_MAX),
+    db: Session = Depends(get_read_db),
+):
+    return response_cache.cached(
+        request,
+        [response_cache.comments_namespace(post_id)],
+        lambda: comment_controller.get_comments(db, post_id, limit, after, after_id),
+    )
 
 
 # 댓글 등록 (로그인 필요)
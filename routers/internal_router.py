@@ -0,0 +1,54 @@
+# routers/internal_router.py
+# 운영용 내부 지표 API
+from fastapi import APIRouter, Depends, Query
+
+from auth_utils import require_internal_token, user_cache_stats
+from controllers import response_cache
+from controllers.upload_server import get_hot_cache_stats
+from database import pool_status
+from slow_query_log import get_slow_query_report, reset_slow_query_log
+
+# 모든 엔드포인트에 INTERNAL_TOKEN 필요 (미설정 시 404)
+router = APIRouter(
+    prefix="/_internal",
+    tags=["Internal"],
+    dependencies=[Depends(require_internal_token)],
+    include_in_schema=False,
+)
+
+
+# 인증 유저 캐시 적중률
+@router.get("/auth-cache")
+def auth_cache_stats():
+    return user_cache_stats()
+
+
+# DB 커넥션 풀 상태 (사용 중 커넥션, 오버플로, 대기 시간, 체크아웃 지연 히스토그램)
+@router.get("/pool")
+def pool_stats():
+    return pool_status()
+
+
+# /uploads 메모리 캐시 적중률
+@router.get("/upload-cache")
+def upload_cache_stats():
+    return get_hot_cache_stats()
+
+
+# 목록/댓글 응답 캐시 적중률
+@router.get("/response-cache")
+def response_cache_stats():
+    return response_cache.get_stats()
+
+
+# SQL 지문별 실행 횟수/총 시간 상위 N개 + 최근 느린 쿼리 (EXPLAIN 포함)
+@router.get("/slow-queries")
+def slow_queries(limit: int = Query(20, ge=1, le=100)):
+    return get_slow_query_report(limit)
+
+
+# 집계 초기화 (인덱스 추가 등 조치 후 다시 측정할 때)
+@router.delete("/slow-queries")
+def clear_slow_queries():
+    reset_slow_query_log()
+    return {"message": "느린 쿼리 집계를 초기화했습니다."}
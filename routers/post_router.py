@@ -1,24 +1,58 @@
 # routers/post_router.py
-from fastapi import APIRouter, UploadFile, File, Form, Depends
+from fastapi import APIRouter, UploadFile, File, Form, Depends, Query, Request
 from sqlalchemy.orm import Session
 
-from controllers import post_controller
+from controllers import post_controller, response_cache
 from models.post_model import PostCreate, PostUpdate
-from database import get_db
-from auth_utils import get_current_user
+from database import get_db, get_read_db
+from auth_utils import get_current_user, get_current_user_optional
 from models.user_model import UserORM
 
 router = APIRouter(prefix="/posts", tags=["Posts"])
 
 
+# 응답 캐시 (글/좋아요/댓글 쓰기 시 무효화, ETag로 304)
 @router.get("")
-def get_all_posts(db: Session = Depends(get_db)):
-    return post_controller.get_all_posts(db)
+def get_all_posts(
+    request: Request,
+    limit: int = Query(post_controller.FEED_DEFAULT_LIMIT, ge=1, le=post_controller.FEED_MAX_LIMIT),
+    cursor: str | None = Query(None),
+    include_count: bool = Query(False),
+    db: Session = Depends(get_read_db),
+    current_user: UserORM | None = Depends(get_current_user_optional),
+):
+    return response_cache.cached(
+        request,
+        [response_cache.FEED],
+        lambda: post_controller.get_all_posts(db, limit, cursor, include_count, current_user),
+        current_user,
+    )
+
+
+# 검색 (/{post_id}보다 먼저 선언해야 "search"가 post_id로 잡히지 않음)
+@router.get("/search")
+def search_posts(
+    q: str = Query(..., min_length=1, max_length=post_controller.SEARCH_QUERY_MAX_LENGTH),
+    limit: int = Query(post_controller.SEARCH_DEFAULT_LIMIT, ge=1, le=post_controller.SEARCH_MAX_LIMIT),
+    cursor: str | None = Query(None),
+    db: Session = Depends(get_read_db),
+    current_user: UserORM | None = Depends(get_current_user_optional),
+):
+    return post_controller.search_posts(db, q, limit, cursor, current_user)
 
 
 @router.get("/{post_id}")
-def get_post_detail(post_id: int, db: Session = Depends(get_db)):
-    return post_controller.get_post_detail(db, post_id)
+def get_post_detail(
+    post_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: UserORM | None = Depends(get_current_user_optional),
+):
+    return post_controller.get_post_detail(db, post_id, current_user)
+
+
+@router.get("/{post_id}/ai-comment")
+def get_ai_comment_status(post_id: int, db: Session = Depends(get_db)):
+    return post_controller.get_ai_comment_status(db, post_id)
 
 
 @router.post("")
@@ -61,4 +95,4 @@ def toggle_like(
     db: Session = Depends(get_db),
     current_user: UserORM = Depends(get_current_user),
 ):
-    return post_controller.toggle_like(db, post_id)
+    return post_controller.toggle_like(db, post_id, current_user)
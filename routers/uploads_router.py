@@ -0,0 +1,12 @@
+# routers/uploads_router.py
+# 업로드 이미지 제공 (/uploads/..., /api 밖)
+from fastapi import APIRouter, Request
+
+from controllers.upload_server import serve_upload
+
+router = APIRouter(prefix="/uploads", tags=["Uploads"])
+
+
+@router.api_route("/{file_path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+def get_upload(file_path: str, request: Request):
+    return serve_upload(request, file_path)
@@ -0,0 +1,62 @@
+# scripts/backfill_excerpts.py
+# posts.excerpt 백필 (게시글 작성/수정 시와 같은 규칙: 공백 정리 후 최대 100자, 넘치면 99자 + "…")
+# excerpt 컬럼을 추가한 직후 한 번 실행한다.
+# 잠금 시간을 줄이기 위해 id 범위 단위로 나눠서 커밋한다.
+#
+# 사용법 (프로젝트 루트에서, DATABASE_URL 필요):
+#   python -m scripts.backfill_excerpts            # excerpt가 비어 있는 게시글만
+#   python -m scripts.backfill_excerpts --all      # 전체 다시 계산 (규칙이 다른 값만 갱신)
+#   python -m scripts.backfill_excerpts --dry-run  # 갱신 대상 게시글 수만 출력
+import argparse
+
+from sqlalchemy import func, select, update
+
+from controllers.post_controller import _make_excerpt
+from database import SessionLocal
+from models.post_model import PostORM
+
+
+def backfill(batch_size: int = 1000, only_missing: bool = True, dry_run: bool = False) -> int:
+    db = SessionLocal()
+    fixed = 0
+    try:
+        max_id = db.query(func.max(PostORM.id)).scalar() or 0
+
+        for start in range(0, max_id, batch_size):
+            query = select(PostORM.id, PostORM.content, PostORM.excerpt).where(
+                PostORM.id > start, PostORM.id <= start + batch_size
+            )
+            if only_missing:
+                query = query.where(PostORM.excerpt.is_(None))
+
+            changes = []
+            for post_id, content, excerpt in db.execute(query):
+                new_excerpt = _make_excerpt(content or "")
+                if new_excerpt != excerpt:
+                    changes.append({"id": post_id, "excerpt": new_excerpt})
+
+            fixed += len(changes)
+            if dry_run or not changes:
+                continue
+
+            db.execute(update(PostORM), changes)
+            db.commit()
+    finally:
+        db.close()
+    return fixed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--all", action="store_true")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    fixed = backfill(args.batch_size, not args.all, args.dry_run)
+    label = "갱신 대상" if args.dry_run else "갱신 완료"
+    print(f"{label}: 게시글 {fixed}개")
+
+
+if __name__ == "__main__":
+    main()
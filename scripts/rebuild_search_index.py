@@ -0,0 +1,25 @@
+# scripts/rebuild_search_index.py
+# 검색 인덱스(search_docs) 생성 + 전체 재색인
+# 검색 기능을 처음 켤 때 한 번 실행한다. 이후에는 게시글/댓글 쓰기 시 자동으로 갱신된다.
+#
+# 사용법 (프로젝트 루트에서, DATABASE_URL 필요):
+#   python -m scripts.rebuild_search_index --batch-size 5000
+import argparse
+import time
+
+from controllers import search_index
+from database import engine
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    indexed = search_index.rebuild(engine, args.batch_size)
+    print(f"색인 완료: 문서 {indexed}개 ({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
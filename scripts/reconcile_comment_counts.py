@@ -0,0 +1,66 @@
+# scripts/reconcile_comment_counts.py
+# posts.comment_count 백필 / 정합성 보정
+# comment_count 컬럼을 추가한 직후 한 번 실행하고, 이후에는 값이 어긋났을 때 실행한다.
+# 잠금 시간을 줄이기 위해 id 범위 단위로 나눠서 커밋한다.
+#
+# 사용법 (프로젝트 루트에서, DATABASE_URL 필요):
+#   python -m scripts.reconcile_comment_counts            # 보정
+#   python -m scripts.reconcile_comment_counts --dry-run  # 어긋난 게시글 수만 출력
+import argparse
+
+from sqlalchemy import func, select, update
+
+from database import SessionLocal
+from models.comment_model import CommentORM
+from models.post_model import PostORM
+
+
+def _actual_count():
+    return (
+        select(func.count(CommentORM.id))
+        .where(CommentORM.post_id == PostORM.id)
+        .scalar_subquery()
+    )
+
+
+def reconcile(batch_size: int = 1000, dry_run: bool = False) -> int:
+    db = SessionLocal()
+    fixed = 0
+    try:
+        max_id = db.query(func.max(PostORM.id)).scalar() or 0
+        actual = _actual_count()
+
+        for start in range(0, max_id, batch_size):
+            in_range = (PostORM.id > start, PostORM.id <= start + batch_size)
+            mismatched = (func.coalesce(PostORM.comment_count, -1) != actual)
+
+            if dry_run:
+                fixed += db.query(func.count(PostORM.id)).filter(*in_range, mismatched).scalar()
+                continue
+
+            result = db.execute(
+                update(PostORM)
+                .where(*in_range, mismatched)
+                .values(comment_count=actual)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            fixed += result.rowcount
+    finally:
+        db.close()
+    return fixed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    fixed = reconcile(args.batch_size, args.dry_run)
+    label = "보정 대상" if args.dry_run else "보정 완료"
+    print(f"{label}: 게시글 {fixed}개")
+
+
+if __name__ == "__main__":
+    main()
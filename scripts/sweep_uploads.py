@@ -0,0 +1,26 @@
+# scripts/sweep_uploads.py
+# 참조되지 않는 업로드 파일 정리
+# 게시글 저장 트랜잭션이 실패하면 upload_blobs 행 없이 파일(또는 임시 파일)만 남을 수 있다.
+# 주기적으로(cron 등) 실행해 grace 시간보다 오래된 것만 지운다.
+#
+# 사용법 (프로젝트 루트에서, DATABASE_URL 필요):
+#   python -m scripts.sweep_uploads --dry-run            # 지울 파일 수만 출력
+#   python -m scripts.sweep_uploads --grace-seconds 3600
+import argparse
+
+from controllers.upload_storage import sweep_orphans
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--grace-seconds", type=float, default=3600)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    result = sweep_orphans(args.grace_seconds, args.dry_run)
+    action = "삭제 대상" if args.dry_run else "삭제"
+    print(f"{action}: 참조 없는 파일 {result['orphaned_files']}개, 임시 파일 {result['temp_files']}개")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+# slow_query_log.py
+# 느린 쿼리 로그 (SQLAlchemy 엔진 이벤트)
+# - 모든 SQL을 지문(fingerprint, 값/IN 목록을 ?로 바꾼 문장)별로 횟수/총 시간/최대 시간 집계
+# - SLOW_QUERY_MS를 넘은 쿼리는 SLOW_QUERY_SAMPLE_RATE 비율로 "slow_query" 로거에 JSON 한 줄로 기록
+#   (지문, 바인드 파라미터 타입(값은 기록하지 않음), 호출한 controller 함수, EXPLAIN 결과)
+# - EXPLAIN은 같은 커넥션에서 실행하며, 지문마다 EXPLAIN_INTERVAL_SECONDS에 한 번만
+# 집계는 GET /api/_internal/slow-queries 에서 총 시간 순으로 확인
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+
+logger = logging.getLogger("slow_query")
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))  # 0이면 느린 쿼리 로그 끔 (집계는 유지)
+SLOW_QUERY_SAMPLE_RATE = float(os.getenv("SLOW_QUERY_SAMPLE_RATE", "1.0"))
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "1") == "1"
+
+EXPLAIN_INTERVAL_SECONDS = 300
+# 지문 수 상한 (넘으면 총 시간이 작은 것부터 정리)
+MAX_FINGERPRINTS = 1000
+RECENT_SIZE = 50
+STATEMENT_MAX_LENGTH = 2000
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|(?<!:):\w+|\?")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))*")
+_SPACES = re.compile(r"\s+")
+_EXPLAINABLE = re.compile(r"^\s*(select|with|update|delete)\b", re.IGNORECASE)
+
+_CONTROLLER_DIR = os.sep + "controllers" + os.sep
+
+
+# -------------------------------
+# 지문 / 파라미터 / 호출 위치
+# -------------------------------
+# SQLAlchemy가 만드는 문장은 같은 문자열이 반복되므로 캐시
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> tuple[str, str]:
+    normalized = _STRING.sub("?", statement)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    # IN (?, ?, ?) / VALUES (?, ?), (?, ?) 는 개수와 상관없이 같은 지문으로
+    normalized = _VALUE_LIST.sub("(...)", normalized)
+    normalized = _SPACES.sub(" ", normalized).strip()
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16], normalized
+
+
+def _value_shape(value) -> str:
+    if isinstance(value, (str, bytes)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def param_shape(parameters, executemany: bool):
+    if executemany:
+        rows = list(parameters or ())
+        return {"rows": len(rows), "row": param_shape(rows[0], False) if rows else None}
+    if isinstance(parameters, dict):
+        return {name: _value_shape(value) for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_value_shape(value) for value in parameters]
+    return None
+
+
+# 스택에서 가장 가까운 controllers/ 함수 (비동기 모드도 run_sync 안에서 실행되므로 같은 스택)
+def find_caller() -> str | None:
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if _CONTROLLER_DIR in filename:
+            module = os.path.splitext(os.path.basename(filename))[0]
+            return f"{module}.{frame.f_code.co_name}:{frame.f_lineno}"
+        frame = frame.f_back
+    return None
+
+
+def _jsonable(value):
+    return value if isinstance(value, (str, int, float, bool, type(None))) else str(value)
+
+
+# ORM 이벤트를 거치지 않도록 DBAPI 커서로 직접 실행 (같은 트랜잭션/커넥션)
+def _explain(conn, statement: str, parameters) -> list[dict]:
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        columns = [column[0] for column in cursor.description]
+        return [{name: _jsonable(value) for name, value in zip(columns, row)} for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+# -------------------------------
+# 집계
+# -------------------------------
+class QueryStats:
+    __slots__ = ("statement", "count", "total_ms", "max_ms", "slow_count", "caller", "explain", "explained_at")
+
+    def __init__(self, statement: str):
+        self.statement = statement
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.slow_count = 0
+        self.caller = None
+        self.explain = None
+        self.explained_at = 0.0
+
+    def snapshot(self, fingerprint_id: str) -> dict:
+        return {
+            "fingerprint": fingerprint_id,
+            "statement": self.statement[:STATEMENT_MAX_LENGTH],
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "slow_count": self.slow_count,
+            "caller": self.caller,
+            "explain": self.explain,
+        }
+
+
+class SlowQueryLog:
+    def __init__(self):
+        self._stats: dict[str, QueryStats] = {}
+        self._recent: deque[dict] = deque(maxlen=RECENT_SIZE)
+        self._lock = threading.Lock()
+
+    def record(self, conn, statement: str, parameters, context, executemany: bool, elapsed_ms: float):
+        fingerprint_id, normalized = fingerprint(statement)
+        slow = 0 < SLOW_QUERY_MS <= elapsed_ms
+
+        with self._lock:
+            stats = self._stats.get(fingerprint_id)
+            if stats is None:
+                if len(self._stats) >= MAX_FINGERPRINTS:
+                    self._evict()
+                stats = self._stats[fingerprint_id] = QueryStats(normalized)
+            stats.count += 1
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            if slow:
+                stats.slow_count += 1
+
+        if not slow or random.random() >= SLOW_QUERY_SAMPLE_RATE:
+            return
+
+        caller = find_caller()
+        explain = None
+        now = time.monotonic()
+        if (
+            SLOW_QUERY_EXPLAIN
+            and not executemany
+            and now - stats.explained_at >= EXPLAIN_INTERVAL_SECONDS
+            and _EXPLAINABLE.match(statement)
+            and not context.execution_options.get("stream_results")
+        ):
+            stats.explained_at = now
+            try:
+                explain = _explain(conn, statement, parameters)
+            except Exception as e:
+                explain = [{"error": str(e)}]
+
+        with self._lock:
+            stats.caller = caller
+            if explain is not None:
+                stats.explain = explain
+
+        entry = {
+            "event": "slow_query",
+            "fingerprint": fingerprint_id,
+            "duration_ms": round(elapsed_ms, 3),
+            "threshold_ms": SLOW_QUERY_MS,
+            "statement": normalized[:STATEMENT_MAX_LENGTH],
+            "params": param_shape(parameters, executemany),
+            "caller": caller,
+            "explain": explain,
+        }
+        self._recent.append(entry)
+        logger.warning(json.dumps(entry, ensure_ascii=False))
+
+    # 총 시간이 작은 지문 10% 정리 (lock 안에서 호출)
+    def _evict(self):
+        ordered = sorted(self._stats.items(), key=lambda item: item[1].total_ms)
+        for fingerprint_id, _ in ordered[: max(1, len(ordered) // 10)]:
+            del self._stats[fingerprint_id]
+
+    def report(self, limit: int) -> dict:
+        with self._lock:
+            items = sorted(self._stats.items(), key=lambda item: item[1].total_ms, reverse=True)[:limit]
+            top = [stats.snapshot(fingerprint_id) for fingerprint_id, stats in items]
+            fingerprints = len(self._stats)
+        return {
+            "threshold_ms": SLOW_QUERY_MS,
+            "sample_rate": SLOW_QUERY_SAMPLE_RATE,
+            "fingerprints": fingerprints,
+            "top": top,
+            "recent": list(self._recent),
+        }
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._recent.clear()
+
+
+slow_query_log = SlowQueryLog()
+
+
+# 엔진에 연결 (비동기 엔진은 sync_engine을 전달)
+def attach(engine):
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._slow_query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - context._slow_query_started) * 1000
+        slow_query_log.record(conn, statement, parameters, context, executemany, elapsed_ms)
+
+
+def get_slow_query_report(limit: int = 20) -> dict:
+    return slow_query_log.report(limit)
+
+
+def reset_slow_query_log():
+    slow_query_log.reset()